@@ -7,6 +7,7 @@
 
 #include "backtest/event_queue.h"
 #include "backtest/execution_engine.h"
+#include "backtest/tick_tape.h"
 #include "core/events.h"
 
 namespace trading::strategies { class StrategyBase; }
@@ -29,6 +30,9 @@ public:
 
     void push_event(const Event& event);
 
+    // Historical ticks replayed by index during run(), merged with the queue by timestamp
+    void set_tick_tape(std::shared_ptr<const TickTape> tape);
+
 private:
     void handle_event(const Event& event);
 
@@ -39,6 +43,7 @@ private:
 
     std::shared_ptr<EventQueue> queue_;
     std::shared_ptr<ExecutionEngine> execution_engine_;
+    std::shared_ptr<const TickTape> tape_;
 
     std::atomic<bool> running_{false};
     size_t events_processed_{0};
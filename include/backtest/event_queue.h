@@ -1,21 +1,26 @@
 #ifndef EVENT_QUEUE_H
 #define EVENT_QUEUE_H
 
+#include <algorithm>
 #include <atomic>
 #include <condition_variable>
+#include <cstdint>
 #include <mutex>
-#include <queue>
+#include <vector>
 
 #include "core/events.h"
 
 namespace trading::backtest {
 
 using trading::events::Event;
-using trading::events::EventComparator;
 
 // ============================================================================
 // Thread-safe Priority Event Queue (Chronological Processing)
 // ============================================================================
+// 4-ary min-heap over a contiguous vector: half the depth of a binary heap,
+// and the four children of a node are adjacent in memory. Each slot caches
+// the event timestamp, so sifting compares integers instead of visiting the
+// variant. Events with equal timestamps pop in insertion order (FIFO).
 
 class EventQueue {
 public:
@@ -28,42 +33,50 @@ public:
     void push(Event event) {
         {
             std::lock_guard<std::mutex> lock(mutex_);
-            queue_.push(std::move(event));
+            const int64_t key = trading::events::get_timestamp(event).count();
+            heap_.push_back(Entry{key, next_sequence_++, std::move(event)});
+            sift_up(heap_.size() - 1);
         }
         cv_.notify_one();
     }
 
     Event pop() {
         std::unique_lock<std::mutex> lock(mutex_);
-        cv_.wait(lock, [&]() { return !queue_.empty() || stopped_; });
+        cv_.wait(lock, [&]() { return !heap_.empty() || stopped_; });
 
-        if (queue_.empty()) {
+        if (heap_.empty()) {
             return {};
         }
-
-        Event event = std::move(queue_.top());
-        queue_.pop();
-        return event;
+        return pop_top();
     }
 
     bool try_pop(Event& out_event) {
         std::lock_guard<std::mutex> lock(mutex_);
-        if (queue_.empty()) {
+        if (heap_.empty()) {
             return false;
         }
-        out_event = std::move(queue_.top());
-        queue_.pop();
+        out_event = pop_top();
         return true;
     }
 
     bool empty() const {
         std::lock_guard<std::mutex> lock(mutex_);
-        return queue_.empty();
+        return heap_.empty();
+    }
+
+    // Timestamp (ns) of the next event to pop, without popping it
+    bool peek_timestamp(int64_t& out_timestamp) const {
+        std::lock_guard<std::mutex> lock(mutex_);
+        if (heap_.empty()) {
+            return false;
+        }
+        out_timestamp = heap_.front().timestamp;
+        return true;
     }
 
     size_t size() const {
         std::lock_guard<std::mutex> lock(mutex_);
-        return queue_.size();
+        return heap_.size();
     }
 
     void stop() {
@@ -79,7 +92,72 @@ public:
     }
 
 private:
-    std::priority_queue<Event, std::vector<Event>, EventComparator> queue_;
+    static constexpr size_t arity = 4;
+
+    struct Entry {
+        int64_t timestamp;   // Cached sort key (nanoseconds)
+        uint64_t sequence;   // Insertion order, breaks timestamp ties
+        Event event;
+    };
+
+    static bool before(const Entry& a, const Entry& b) noexcept {
+        return a.timestamp < b.timestamp
+            || (a.timestamp == b.timestamp && a.sequence < b.sequence);
+    }
+
+    // Hole-based sifts: the moving entry is written once, at its final slot
+    void sift_up(size_t i) {
+        Entry item = std::move(heap_[i]);
+        while (i > 0) {
+            const size_t parent = (i - 1) / arity;
+            if (!before(item, heap_[parent])) {
+                break;
+            }
+            heap_[i] = std::move(heap_[parent]);
+            i = parent;
+        }
+        heap_[i] = std::move(item);
+    }
+
+    void sift_down(size_t i) {
+        const size_t n = heap_.size();
+        Entry item = std::move(heap_[i]);
+        while (true) {
+            const size_t first = (arity * i) + 1;
+            if (first >= n) {
+                break;
+            }
+            const size_t last = std::min(first + arity, n);
+            size_t best = first;
+            for (size_t c = first + 1; c < last; ++c) {
+                if (before(heap_[c], heap_[best])) {
+                    best = c;
+                }
+            }
+            if (!before(heap_[best], item)) {
+                break;
+            }
+            heap_[i] = std::move(heap_[best]);
+            i = best;
+        }
+        heap_[i] = std::move(item);
+    }
+
+    // Caller holds the lock and has checked the heap is not empty
+    Event pop_top() {
+        Event event = std::move(heap_.front().event);
+        if (heap_.size() > 1) {
+            heap_.front() = std::move(heap_.back());
+            heap_.pop_back();
+            sift_down(0);
+        } else {
+            heap_.pop_back();
+        }
+        return event;
+    }
+
+    std::vector<Entry> heap_;
+    uint64_t next_sequence_ = 0;
     mutable std::mutex mutex_;
     std::condition_variable cv_;
     std::atomic<bool> stopped_{false};
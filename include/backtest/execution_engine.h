@@ -1,13 +1,16 @@
 #ifndef EXECUTION_ENGINE_H
 #define EXECUTION_ENGINE_H
 
+#include <cmath>
 #include <functional>
+#include <stdexcept>
 #include <string>
 #include <unordered_map>
 #include <utility>
 #include <vector>
 
 #include "backtest/event_queue.h"
+#include "backtest/tick_tape.h"
 #include "core/events.h"
 
 namespace trading::backtest {
@@ -27,6 +30,39 @@ struct SlippageInput {
 
 using SlippageModel = std::function<Price(const SlippageInput&)>;
 
+/// @brief Built-in slippage models, computed natively (no call back into Python per fill).
+/// @details Prices move against the taker: up for buys, down for sells.
+/// - FixedOffset: mid ± coefficient.
+/// - Linear: mid · (1 ± coefficient · qty / liquidity).
+/// - SqrtImpact: mid · (1 ± coefficient · sqrt(qty / liquidity)).
+/// - Callback: user-supplied SlippageModel.
+enum class SlippageKind {
+    FixedOffset,
+    Linear,
+    SqrtImpact,
+    Callback
+};
+
+/// @brief Evaluates one of the built-in models.
+/// @param kind Model to apply (must not be Callback).
+/// @param coefficient Offset (FixedOffset) or impact coefficient (Linear, SqrtImpact).
+inline Price native_slippage(SlippageKind kind, double coefficient, const SlippageInput& input) noexcept {
+    const double direction = input.side == Side::BUY ? 1.0 : -1.0;
+    // An empty book counts as full participation
+    const double participation = input.available_liquidity > 0.0
+                                     ? input.order_qty / input.available_liquidity
+                                     : 1.0;
+    switch (kind) {
+    case SlippageKind::Linear:
+        return input.mid_price * (1.0 + direction * coefficient * participation);
+    case SlippageKind::SqrtImpact:
+        return input.mid_price * (1.0 + direction * coefficient * std::sqrt(participation));
+    case SlippageKind::FixedOffset:
+    default:
+        return input.mid_price + direction * coefficient;
+    }
+}
+
 // ============================================================================
 // Execution Engine
 // ============================================================================
@@ -34,12 +70,37 @@ using SlippageModel = std::function<Price(const SlippageInput&)>;
 class ExecutionEngine {
 public:
     explicit ExecutionEngine(EventQueue& event_queue, SlippageModel slippage_model)
-        : event_queue_(event_queue), slippage_model_(std::move(slippage_model)) {}
+        : event_queue_(event_queue),
+          slippage_kind_(SlippageKind::Callback),
+          slippage_model_(std::move(slippage_model)) {}
+
+    ExecutionEngine(EventQueue& event_queue, SlippageKind kind, double coefficient)
+        : event_queue_(event_queue), slippage_kind_(kind), slippage_coefficient_(coefficient) {
+        if (kind == SlippageKind::Callback) {
+            throw std::invalid_argument("ExecutionEngine: SlippageKind::Callback needs a slippage model");
+        }
+    }
 
     void on_tick(const TickEvent& tick) {
         last_ticks_[tick.symbol] = tick;
     }
 
+    // Tape replay: refresh the cached tick in place (the symbol string is
+    // only copied the first time a symbol is seen)
+    void on_tick(const TickTape& tape, size_t i) {
+        TickEvent& tick = last_ticks_[tape.symbol(i)];
+        if (tick.symbol.empty()) {
+            tick.symbol = tape.symbol(i);
+        }
+        tick.timestamp = make_timestamp(tape.timestamp(i));
+        tick.bid = tape.bid(i);
+        tick.ask = tape.ask(i);
+        tick.bid_volume = tape.bid_volume(i);
+        tick.ask_volume = tape.ask_volume(i);
+        tick.last = tape.last(i);
+        tick.last_volume = tape.last_volume(i);
+    }
+
     void on_order(const OrderEvent& order) {
         auto it = last_ticks_.find(order.symbol);
         if (it == last_ticks_.end()) {
@@ -74,6 +135,8 @@ public:
 
 private:
     EventQueue& event_queue_;
+    SlippageKind slippage_kind_;
+    double slippage_coefficient_ = 0.0;
     SlippageModel slippage_model_;
 
     std::unordered_map<std::string, TickEvent> last_ticks_;
@@ -91,7 +154,10 @@ private:
             .available_liquidity = tick.bid_volume + tick.ask_volume,
             .side = order.side};
 
-        Price slipped_price = slippage_model_(input);
+        // Only the Callback kind leaves native code (and, from Python, takes the GIL)
+        Price slipped_price = slippage_kind_ == SlippageKind::Callback
+                                  ? slippage_model_(input)
+                                  : native_slippage(slippage_kind_, slippage_coefficient_, input);
 
         if (!order.is_market_order()) {
             if (order.side == Side::BUY && slipped_price > order.limit_price) {
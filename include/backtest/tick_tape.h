@@ -0,0 +1,177 @@
+#ifndef TICK_TAPE_H
+#define TICK_TAPE_H
+
+#include <cstddef>
+#include <cstdint>
+#include <stdexcept>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+#include "core/events.h"
+
+namespace trading::backtest {
+
+using trading::events::TickEvent;
+
+// ============================================================================
+// Symbol Table (string interning)
+// ============================================================================
+
+class SymbolTable {
+public:
+    /// @brief Returns the id of `symbol`, adding it on first use.
+    uint32_t intern(const std::string& symbol) {
+        auto it = ids_.find(symbol);
+        if (it != ids_.end()) {
+            return it->second;
+        }
+        const auto id = static_cast<uint32_t>(names_.size());
+        names_.push_back(symbol);
+        ids_.emplace(symbol, id);
+        return id;
+    }
+
+    const std::string& name(uint32_t id) const {
+        return names_.at(id);
+    }
+
+    const std::vector<std::string>& names() const noexcept {
+        return names_;
+    }
+
+    size_t size() const noexcept {
+        return names_.size();
+    }
+
+private:
+    std::vector<std::string> names_;
+    std::unordered_map<std::string, uint32_t> ids_;
+};
+
+// ============================================================================
+// Tick Tape (columnar historical ticks)
+// ============================================================================
+// Structure of arrays: one contiguous column per TickEvent field and a
+// 32-bit symbol id instead of a string per tick. Ticks must be appended in
+// chronological order; the backtest replays them by index, merged with the
+// event queue by timestamp, without building an Event per row.
+
+class TickTape {
+public:
+    TickTape() = default;
+
+    void reserve(size_t n) {
+        timestamps_.reserve(n);
+        symbol_ids_.reserve(n);
+        bid_.reserve(n);
+        ask_.reserve(n);
+        bid_volume_.reserve(n);
+        ask_volume_.reserve(n);
+        last_.reserve(n);
+        last_volume_.reserve(n);
+    }
+
+    uint32_t intern(const std::string& symbol) {
+        return symbols_.intern(symbol);
+    }
+
+    /// @brief Appends one tick.
+    /// @param timestamp Nanoseconds since epoch; must not precede the previous tick.
+    /// @param symbol_id Id returned by intern().
+    void append_tick(int64_t timestamp, uint32_t symbol_id,
+                     double bid, double ask, double bid_volume, double ask_volume,
+                     double last, double last_volume) {
+        if (!timestamps_.empty() && timestamp < timestamps_.back()) {
+            throw std::invalid_argument("TickTape: ticks must be appended in chronological order");
+        }
+        if (symbol_id >= symbols_.size()) {
+            throw std::out_of_range("TickTape: unknown symbol id");
+        }
+        timestamps_.push_back(timestamp);
+        symbol_ids_.push_back(symbol_id);
+        bid_.push_back(bid);
+        ask_.push_back(ask);
+        bid_volume_.push_back(bid_volume);
+        ask_volume_.push_back(ask_volume);
+        last_.push_back(last);
+        last_volume_.push_back(last_volume);
+    }
+
+    /// @brief Appends `n` ticks given as parallel columns, all or nothing.
+    /// @details Every row is validated (chronological order, known symbol id) before the
+    /// first one is appended, so a bad row leaves the tape unchanged.
+    void extend(size_t n, const int64_t* timestamps, const uint32_t* symbol_ids,
+                const double* bid, const double* ask, const double* bid_volume,
+                const double* ask_volume, const double* last, const double* last_volume) {
+        if (n == 0) {
+            return;
+        }
+        int64_t previous = timestamps_.empty() ? timestamps[0] : timestamps_.back();
+        for (size_t i = 0; i < n; ++i) {
+            if (timestamps[i] < previous) {
+                throw std::invalid_argument("TickTape: ticks must be appended in chronological order");
+            }
+            if (symbol_ids[i] >= symbols_.size()) {
+                throw std::out_of_range("TickTape: unknown symbol id");
+            }
+            previous = timestamps[i];
+        }
+
+        reserve(size() + n);
+        timestamps_.insert(timestamps_.end(), timestamps, timestamps + n);
+        symbol_ids_.insert(symbol_ids_.end(), symbol_ids, symbol_ids + n);
+        bid_.insert(bid_.end(), bid, bid + n);
+        ask_.insert(ask_.end(), ask, ask + n);
+        bid_volume_.insert(bid_volume_.end(), bid_volume, bid_volume + n);
+        ask_volume_.insert(ask_volume_.end(), ask_volume, ask_volume + n);
+        last_.insert(last_.end(), last, last + n);
+        last_volume_.insert(last_volume_.end(), last_volume, last_volume + n);
+    }
+
+    size_t size() const noexcept { return timestamps_.size(); }
+    bool empty() const noexcept { return timestamps_.empty(); }
+
+    int64_t timestamp(size_t i) const { return timestamps_[i]; }
+    uint32_t symbol_id(size_t i) const { return symbol_ids_[i]; }
+    const std::string& symbol(size_t i) const { return symbols_.name(symbol_ids_[i]); }
+    double bid(size_t i) const { return bid_[i]; }
+    double ask(size_t i) const { return ask_[i]; }
+    double bid_volume(size_t i) const { return bid_volume_[i]; }
+    double ask_volume(size_t i) const { return ask_volume_[i]; }
+    double last(size_t i) const { return last_[i]; }
+    double last_volume(size_t i) const { return last_volume_[i]; }
+
+    const SymbolTable& symbols() const noexcept { return symbols_; }
+
+    /// @brief Materialises row `i` as a TickEvent (for per-row access from Python).
+    TickEvent event(size_t i) const {
+        if (i >= size()) {
+            throw std::out_of_range("TickTape index out of range");
+        }
+        return TickEvent{
+            trading::events::make_timestamp(timestamps_[i]),
+            symbol(i),
+            bid_[i],
+            ask_[i],
+            bid_volume_[i],
+            ask_volume_[i],
+            last_[i],
+            last_volume_[i]};
+    }
+
+private:
+    std::vector<int64_t> timestamps_;
+    std::vector<uint32_t> symbol_ids_;
+    std::vector<double> bid_;
+    std::vector<double> ask_;
+    std::vector<double> bid_volume_;
+    std::vector<double> ask_volume_;
+    std::vector<double> last_;
+    std::vector<double> last_volume_;
+    SymbolTable symbols_;
+};
+
+} // namespace trading::backtest
+
+#endif // TICK_TAPE_H
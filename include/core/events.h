@@ -5,10 +5,16 @@
 #include <string>
 #include <variant>
 #include <cstdint>
+#include <type_traits>
 
 namespace trading::events {
 
+// Nanoseconds since epoch. std::chrono::nanoseconds is a bare int64_t count: no
+// clock/time_point object, so comparing two timestamps is a single integer compare
+// and Python sees plain ints (make_timestamp / .timestamp).
 using Timestamp = std::chrono::nanoseconds;
+static_assert(std::is_same_v<Timestamp::rep, int64_t>, "Timestamp must be an int64 count");
+static_assert(sizeof(Timestamp) == sizeof(int64_t) && std::is_trivially_copyable_v<Timestamp>);
 using Price = double;
 using Volume = double;
 using OrderId = uint64_t;
@@ -173,17 +179,6 @@ inline EventType get_event_type(const Event& event) {
     return std::visit([](const auto& e) { return e.type(); }, event);
 }
 
-// Order events
-struct EventComparator {
-    bool operator()(const Event& a, const Event& b) const {
-        // Remember: std::priority_queue is max-heap
-        // and we want min-heap (we don't want to read
-        // the future before we read the past)
-        // Therefore use '>' to compare
-        return get_timestamp(a) > get_timestamp(b); 
-    }
-};
-
 // Efficient timestamp maker
 inline Timestamp make_timestamp(int64_t nanos_since_epoch) {
     return Timestamp{nanos_since_epoch};
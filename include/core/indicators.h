@@ -2,6 +2,7 @@
 #define INDICATORS_H
 
 #include <vector>
+#include <cstddef>
 #include <cmath>
 #include <numeric>
 #include <algorithm>
@@ -16,18 +17,48 @@
 /// @return SMA values as a vector of doubles.
 std::vector<double> compute_sma(const std::vector<double>& input, const int& window);
 
+/// @brief Raw-buffer SMA kernel: writes directly into a caller-owned output buffer.
+/// @param input Pointer to `size` contiguous input values.
+/// @param size Number of input values.
+/// @param window Window size for the SMA calculation.
+/// @param output Pointer to `size` contiguous output values (NaN until the window fills).
+/// @tparam In Input element type (double or float).
+/// @tparam T Output element type (double or float); accumulation always runs in double.
+template <typename In, typename T>
+void compute_sma(const In* input, size_t size, int window, T* output);
+
 /// @brief Calculates the Exponential Moving Average (EMA) of the input data over a specified window.
 /// @param input Input data as a vector of doubles.
 /// @param window Window size for the EMA calculation.
 /// @return EMA values as a vector of doubles.
 std::vector<double> compute_ema(const std::vector<double>& input, const int& window);
 
+/// @brief Raw-buffer EMA kernel: writes directly into a caller-owned output buffer.
+/// @param input Pointer to `size` contiguous input values.
+/// @param size Number of input values.
+/// @param window Window size for the EMA calculation.
+/// @param output Pointer to `size` contiguous output values.
+/// @tparam In Input element type (double or float).
+/// @tparam T Output element type (double or float); accumulation always runs in double.
+template <typename In, typename T>
+void compute_ema(const In* input, size_t size, int window, T* output);
+
 /// @brief Calculates the Relative Strength Index (RSI) of the input data over a specified window.
 /// @param input Input data as a vector of doubles.
 /// @param window Window size for the RSI calculation.
 /// @return RSI values as a vector of doubles.
 std::vector<double> compute_rsi(const std::vector<double>& input, const int& window);
 
+/// @brief Raw-buffer RSI kernel: writes directly into a caller-owned output buffer.
+/// @param input Pointer to `size` contiguous input values.
+/// @param size Number of input values.
+/// @param window Window size for the RSI calculation.
+/// @param output Pointer to `size` contiguous output values (NaN before index `window`).
+/// @tparam In Input element type (double or float).
+/// @tparam T Output element type (double or float); accumulation always runs in double.
+template <typename In, typename T>
+void compute_rsi(const In* input, size_t size, int window, T* output);
+
 /// @brief Calculates the Bollinger Bands of the input data over a specified window.
 /// @param input Input data as a vector of doubles.
 /// @param window Window size for the Bollinger Bands calculation.
@@ -36,6 +67,20 @@ std::vector<double> compute_rsi(const std::vector<double>& input, const int& win
 std::tuple<std::vector<double>, std::vector<double>, std::vector<double>> 
 compute_bollinger_bands(const std::vector<double>& input, const int& window, const double& k);
 
+/// @brief Raw-buffer Bollinger Bands kernel: running sum and sum of squares, one pass.
+/// @param input Pointer to `size` contiguous input values.
+/// @param size Number of input values.
+/// @param window Window size for the Bollinger Bands calculation.
+/// @param k Standard deviation multiplier.
+/// @param upper_out Pointer to `size` contiguous upper band values.
+/// @param mid_out Pointer to `size` contiguous middle band values.
+/// @param lower_out Pointer to `size` contiguous lower band values.
+/// @tparam In Input element type (double or float).
+/// @tparam T Output element type (double or float); accumulation always runs in double.
+template <typename In, typename T>
+void compute_bollinger_bands(const In* input, size_t size, int window, double k,
+                             T* upper_out, T* mid_out, T* lower_out);
+
 /// @brief Calculates the Moving Average Convergence Divergence (MACD) of the input data.
 /// @param input Input data as a vector of doubles.
 /// @param fast_period Fast EMA window size.
@@ -45,6 +90,59 @@ compute_bollinger_bands(const std::vector<double>& input, const int& window, con
 std::tuple<std::vector<double>, std::vector<double>> 
 compute_macd(const std::vector<double>& input, const int& fast_period, const int& slow_period, const int& signal_period);
 
+/// @brief Raw-buffer MACD kernel: fast EMA, slow EMA and signal EMA advance together in one pass.
+/// @param input Pointer to `size` contiguous input values.
+/// @param size Number of input values.
+/// @param fast_period Fast EMA window size.
+/// @param slow_period Slow EMA window size.
+/// @param signal_period Signal line EMA window size.
+/// @param macd_out Pointer to `size` contiguous MACD line values.
+/// @param signal_out Pointer to `size` contiguous signal line values.
+/// @tparam In Input element type (double or float).
+/// @tparam T Output element type (double or float); accumulation always runs in double.
+template <typename In, typename T>
+void compute_macd(const In* input, size_t size, int fast_period, int slow_period,
+                  int signal_period, T* macd_out, T* signal_out);
+
+/// @brief Fused indicator kernel: RSI, MACD and Bollinger Bands in a single pass over the input.
+/// @details Every input value is read once and the three recurrences advance in lockstep.
+/// Each output matches its standalone kernel (same recurrences, same warm-up NaNs).
+/// @param input Pointer to `size` contiguous input values.
+/// @param size Number of input values.
+/// @param rsi_window Window size for the RSI calculation.
+/// @param bb_window Window size for the Bollinger Bands calculation.
+/// @param bb_k Standard deviation multiplier.
+/// @param macd_fast Fast EMA window size.
+/// @param macd_slow Slow EMA window size.
+/// @param macd_signal Signal line EMA window size.
+/// @param rsi_out Pointer to `size` contiguous RSI values.
+/// @param macd_out Pointer to `size` contiguous MACD line values.
+/// @param signal_out Pointer to `size` contiguous signal line values.
+/// @param upper_out Pointer to `size` contiguous upper band values.
+/// @param mid_out Pointer to `size` contiguous middle band values.
+/// @param lower_out Pointer to `size` contiguous lower band values.
+/// @tparam In Input element type (double or float).
+/// @tparam T Output element type (double or float); accumulation always runs in double.
+template <typename In, typename T>
+void compute_all(const In* input, size_t size, int rsi_window, int bb_window, double bb_k,
+                 int macd_fast, int macd_slow, int macd_signal,
+                 T* rsi_out, T* macd_out, T* signal_out, T* upper_out, T* mid_out, T* lower_out);
+
+/// @brief Fused backtest kernel: market/strategy returns, equity curves and drawdown in one pass.
+/// @details Index 0 is NaN in every output (no previous close), matching pandas' pct_change/cumprod.
+/// The strategy return at bar i uses the position held at bar i-1.
+/// @param close Pointer to `size` contiguous close prices.
+/// @param signal Pointer to `size` contiguous positions (1 long, -1 short, 0 flat).
+/// @param size Number of bars.
+/// @param market_returns Output: simple returns of the close price.
+/// @param strategy_returns Output: market returns times the previous bar's position.
+/// @param cum_market Output: cumulative product of (1 + market return).
+/// @param cum_strategy Output: cumulative product of (1 + strategy return).
+/// @param drawdown Output: relative drop of the strategy equity curve from its running maximum.
+void compute_backtest_returns(const double* close, const double* signal, size_t size,
+                              double* market_returns, double* strategy_returns,
+                              double* cum_market, double* cum_strategy, double* drawdown);
+
 // Logic and Strategy
 /// @brief Checks trading signals based on RSI and Bollinger Bands.
 /// @param rsi RSI values as a vector of doubles.
@@ -57,4 +155,12 @@ int compute_signals(const std::vector<double>& rsi,
                     const std::vector<double>& bb_upper, 
                     const std::vector<double>& bb_lower);
 
+/// @brief Checks the trading signal for a single bar (scalar version of compute_signals).
+/// @param rsi RSI value.
+/// @param price Price value.
+/// @param bb_upper Upper Bollinger Band value.
+/// @param bb_lower Lower Bollinger Band value.
+/// @return Trading signal: 1 for buy, -1 for sell, 0 for hold.
+int compute_signals(double rsi, double price, double bb_upper, double bb_lower);
+
 #endif
\ No newline at end of file
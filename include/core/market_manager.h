@@ -1,17 +1,105 @@
 #ifndef MARKET_MANAGER_H
 #define MARKET_MANAGER_H
 
+#include <atomic>
+#include <condition_variable>
+#include <cstdint>
+#include <limits>
+#include <memory>
+#include <mutex>
 #include <unordered_map>
 #include <string>
 #include <vector>
 #include <shared_mutex>
+#include "core/spsc_ring.h"
 #include "core/thread_pool.h"
 #include "core/indicators.h"
+#include "core/streaming_indicators.h"
 
-/// @brief Asset data: vector of prices
+/// @brief Indicator values at the latest update processed for a symbol.
+struct IndicatorSnapshot {
+    double price = std::numeric_limits<double>::quiet_NaN();
+    double rsi = std::numeric_limits<double>::quiet_NaN();
+    double upper = std::numeric_limits<double>::quiet_NaN();
+    double mid = std::numeric_limits<double>::quiet_NaN();
+    double lower = std::numeric_limits<double>::quiet_NaN();
+    int signal = 0;   // 1 for buy, -1 for sell, 0 for hold
+    size_t count = 0; // Prices held in the history ring
+};
+
+/// @brief Asset data: fixed-size ring buffer of prices plus incremental indicator state
 struct AssetData {
-    std::vector<double> prices;
-    void add_price(double price, size_t max_size = 200);
+    static constexpr size_t max_history = 200;
+    static constexpr int64_t no_timestamp = std::numeric_limits<int64_t>::min();
+
+    std::vector<double> prices = std::vector<double>(max_history); // Ring storage, preallocated
+    std::vector<int64_t> timestamps = std::vector<int64_t>(max_history, no_timestamp); // Candle open times (ms)
+    size_t head = 0;  // Next slot to write
+    size_t count = 0; // Number of valid prices (<= max_history)
+    CandleIndicator<RsiState> rsi{RsiState{14}};
+    CandleIndicator<BollingerState> bands{BollingerState{20, 2.0}};
+    IndicatorSnapshot latest; // Written by update_signal
+
+    /// @brief Appends a price in O(1), overwriting the oldest one once full.
+    /// @param price Latest price.
+    /// @param timestamp Candle open time in ms, or `no_timestamp` for plain ticks.
+    void add_price(double price, int64_t timestamp = no_timestamp);
+
+    /// @brief Most recent price (undefined if no price was added).
+    double last_price() const;
+
+    /// @brief Open time of the most recent candle (`no_timestamp` if none or a plain tick).
+    int64_t last_timestamp() const;
+
+    /// @brief Applies a candle update in O(1).
+    /// @details An update for the candle being formed overwrites its slot in place and only
+    /// re-evaluates the indicator tip; a newer open time commits the previous candle to the
+    /// indicators and appends the new one. Stale (older) updates are ignored.
+    /// @param timestamp Candle open time in ms.
+    /// @param close Current close of that candle.
+    /// @return Signal evaluated on the forming candle: 1 for buy, -1 for sell, 0 for hold.
+    int update_candle(int64_t timestamp, double close);
+
+    /// @brief Advances the indicator state with a new price in O(1).
+    /// @param price Latest price.
+    /// @param append True for a new bar, false to replace the close of the current one.
+    /// @return Trading signal: 1 for buy, -1 for sell, 0 for hold.
+    int update_signal(double price, bool append = true);
+};
+
+/// @brief Pending update for a symbol: a plain tick, or a candle update when `timestamp` is set.
+struct TickMsg {
+    int64_t timestamp = AssetData::no_timestamp;
+    double price = 0.0;
+};
+
+/// @brief Candle update addressed by a symbol id (see MarketManager::update_candles_id).
+struct CandleUpdate {
+    uint16_t id = 0;
+    int64_t timestamp = AssetData::no_timestamp;
+    double close = 0.0;
+};
+
+/// @brief Per-symbol state. Updates flow through an SPSC ring that exactly one worker
+/// drains at a time (the one that set `scheduled`), so ticks of a symbol are processed in
+/// order and `data` is never shared between threads. Only the consumer side is lock-free:
+/// producers serialise on `producer_mutex`, and the slot lookup takes `data_mutex` shared.
+struct SymbolSlot {
+    static constexpr size_t ring_capacity = 1024;
+
+    SymbolSlot(std::string name, uint16_t slot_id) : symbol(std::move(name)), id(slot_id) {}
+
+    const std::string symbol;
+    const uint16_t id;                          // Index in MarketManager's id table
+    std::atomic<double> last_price{0.0};       // Written by producers, read lock-free
+    SpscRing<TickMsg, ring_capacity> ring;
+    std::atomic<bool> scheduled{false};         // A drain task is queued or running
+    std::mutex producer_mutex;                  // Serialises producers; never taken by the consumer
+    int64_t last_candle = AssetData::no_timestamp; // Newest candle pushed (guarded by producer_mutex)
+    AssetData data;                             // Owned by the draining worker
+    int last_signal = 0;                        // Last signal evaluated (owned by the draining worker)
+    std::mutex snapshot_mutex;                  // Guards `snapshot`
+    IndicatorSnapshot snapshot;                 // data.latest, published once per drained batch
 };
 
 /// @brief Manages market data and processes updates in a thread-safe manner.
@@ -28,24 +116,118 @@ public:
     ~MarketManager() = default;
 
     /// @brief Update tick data for a given symbol.
+    /// @details Blocks while the symbol's ring is full (see try_update_tick).
     /// @param symbol Asset symbol as a string.
     /// @param price Latest price as a double.
     void update_tick(const std::string& symbol, double price);
 
+    /// @brief Non-blocking update_tick.
+    /// @return False (and nothing queued) if the symbol's ring is full.
+    bool try_update_tick(const std::string& symbol, double price);
+
+    /// @brief Queues a batch of ticks for a symbol, in order (one slot lookup and one
+    /// producer lock for the whole batch). Blocks while the symbol's ring is full.
+    /// @param symbol Asset symbol as a string.
+    /// @param prices Pointer to `count` prices, oldest first.
+    /// @param count Number of prices.
+    void update_ticks(const std::string& symbol, const double* prices, size_t count);
+
+    /// @brief Interns a symbol: returns its integer id, creating its state on first use.
+    /// @details Ids are dense (0, 1, 2, ...) and stable for the manager's lifetime; the
+    /// *_id update methods index a table with them instead of hashing the symbol string.
+    /// @param symbol Asset symbol as a string.
+    /// @return The symbol's id.
+    uint16_t register_symbol(const std::string& symbol);
+
+    /// @brief update_tick for a symbol id returned by register_symbol.
+    void update_tick_id(uint16_t id, double price);
+
+    /// @brief Non-blocking update_tick_id.
+    bool try_update_tick_id(uint16_t id, double price);
+
+    /// @brief update_candle for a symbol id returned by register_symbol.
+    void update_candle_id(uint16_t id, int64_t timestamp, double close);
+
+    /// @brief Non-blocking update_candle_id.
+    bool try_update_candle_id(uint16_t id, int64_t timestamp, double close);
+
+    /// @brief Queues a batch of candle updates that may span several symbols.
+    /// @details Updates are pushed in batch order, so those of the same symbol keep their
+    /// relative order. Blocks while a target ring is full.
+    /// @param updates Pointer to `count` updates; ids come from register_symbol.
+    /// @param count Number of updates.
+    /// @throws std::out_of_range on an unregistered id (updates before it are already queued).
+    void update_candles_id(const CandleUpdate* updates, size_t count);
+
+    /// @brief Update the candle currently being formed for a given symbol.
+    /// @details Ticks of the forming candle replace its close; indicators only commit a
+    /// candle once it has closed, and re-evaluate the forming one in O(1).
+    /// Updates older than the newest candle already received are dropped.
+    /// Blocks while the symbol's ring is full (see try_update_candle).
+    /// @param symbol Asset symbol as a string.
+    /// @param timestamp Candle open time in epoch milliseconds.
+    /// @param close Current close price of that candle.
+    void update_candle(const std::string& symbol, int64_t timestamp, double close);
+
+    /// @brief Non-blocking update_candle.
+    /// @return False (and nothing queued) if the symbol's ring is full.
+    bool try_update_candle(const std::string& symbol, int64_t timestamp, double close);
+
     /// @brief Check last price, for debugging.
+    /// @details Lock-free read of the latest price pushed for the symbol.
     /// @param symbol Asset symbol as a string.
     /// @return Last price as a double.
     double get_last_price(const std::string& symbol);
 
+    /// @brief Indicator values at the latest update processed for a symbol, for debugging.
+    /// @details Published once per drained batch, before the batch counts as processed:
+    /// after wait_until_idle it reflects every update queued so far.
+    /// @param symbol Asset symbol as a string.
+    /// @return The snapshot (default-constructed, `count == 0`, for an unknown symbol).
+    IndicatorSnapshot get_indicators(const std::string& symbol);
+
+    /// @brief Blocks until every update queued so far has been processed (and its signal logged).
+    /// @param timeout_seconds Maximum time to wait.
+    /// @return False if updates were still pending when the timeout expired.
+    bool wait_until_idle(double timeout_seconds);
+
 private:
-    /// @brief Execution in threads
+    /// @brief Finds the slot of a symbol, creating it on first use.
+    SymbolSlot& slot_for(const std::string& symbol);
+
+    /// @brief Slot of a registered symbol id.
+    /// @throws std::out_of_range if the id was never returned by register_symbol.
+    SymbolSlot& slot_at(uint16_t id) const;
+
+    /// @brief Queues an update and schedules a drain if none is pending.
+    /// @param wait Whether to wait for room when the ring is full.
+    /// @return False if the ring was full and `wait` is false.
+    bool push(SymbolSlot& slot, const TickMsg& msg, bool wait);
+
+    /// @brief push() body; the caller holds `slot.producer_mutex`.
+    bool push_locked(SymbolSlot& slot, const TickMsg& msg, bool wait);
+
+    /// @brief Execution in threads: processes every queued update of a symbol, in order.
+    /// @details A signal is only logged when it differs from the symbol's previous one, so a
+    /// BUY/SELL that holds over consecutive ticks is reported once.
+    void drain(SymbolSlot& slot);
+
+    /// @brief Marks updates as processed, waking wait_until_idle once none are left.
+    void finish(size_t processed);
+
+    /// @brief Logs a BUY/SELL signal (no-op for 0).
     /// @param symbol Asset symbol as a string.
-    /// @param price Latest price as a double.
-    void process_symbol(std::string symbol, double price);
+    /// @param price Price the signal was evaluated at.
+    /// @param signal Trading signal: 1 for buy, -1 for sell, 0 for hold.
+    static void log_signal(const std::string& symbol, double price, int signal);
 
-    ThreadPool pool;
-    std::unordered_map<std::string, AssetData> market_data;
-    mutable std::shared_mutex data_mutex; // C++17: Reader-Writer lock
+    std::unordered_map<std::string, std::unique_ptr<SymbolSlot>> market_data;
+    std::vector<SymbolSlot*> slots_by_id; // Same slots, indexed by id
+    mutable std::shared_mutex data_mutex; // C++17: Reader-Writer lock (guards the map and id table)
+    std::atomic<size_t> in_flight{0}; // Updates pushed but not yet processed
+    std::mutex idle_mutex;
+    std::condition_variable idle_cv;  // Notified when in_flight drops to zero
+    ThreadPool pool; // Declared last: destroyed (and joined) before the slots it drains
 };
 
 #endif
\ No newline at end of file
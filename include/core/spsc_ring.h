@@ -0,0 +1,55 @@
+#ifndef SPSC_RING_H
+#define SPSC_RING_H
+
+#include <array>
+#include <atomic>
+#include <cstddef>
+
+/// @brief Bounded lock-free single-producer / single-consumer ring buffer.
+/// @details The producer only writes `tail`, the consumer only writes `head`; each index
+/// lives on its own cache line so the two sides do not false-share. Exactly one thread
+/// may push and one thread may pop at any given time.
+/// @tparam T Trivially copyable element type.
+/// @tparam Capacity Number of slots (power of two).
+template <typename T, size_t Capacity>
+class SpscRing {
+    static_assert(Capacity > 0 && (Capacity & (Capacity - 1)) == 0, "Capacity must be a power of two");
+
+public:
+    /// @brief Appends an item (producer side).
+    /// @return False if the ring is full.
+    bool try_push(const T& item) {
+        const size_t tail = tail_.load(std::memory_order_relaxed);
+        if (tail - head_.load(std::memory_order_acquire) == Capacity) {
+            return false;
+        }
+        buffer_[tail & mask] = item;
+        tail_.store(tail + 1, std::memory_order_release);
+        return true;
+    }
+
+    /// @brief Removes the oldest item (consumer side).
+    /// @return False if the ring is empty.
+    bool try_pop(T& out) {
+        const size_t head = head_.load(std::memory_order_relaxed);
+        if (head == tail_.load(std::memory_order_acquire)) {
+            return false;
+        }
+        out = buffer_[head & mask];
+        head_.store(head + 1, std::memory_order_release);
+        return true;
+    }
+
+    bool empty() const {
+        return head_.load(std::memory_order_acquire) == tail_.load(std::memory_order_acquire);
+    }
+
+private:
+    static constexpr size_t mask = Capacity - 1;
+
+    std::array<T, Capacity> buffer_{};
+    alignas(64) std::atomic<size_t> head_{0}; // Next slot to pop
+    alignas(64) std::atomic<size_t> tail_{0}; // Next slot to push
+};
+
+#endif // SPSC_RING_H
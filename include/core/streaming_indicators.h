@@ -0,0 +1,240 @@
+#ifndef STREAMING_INDICATORS_H
+#define STREAMING_INDICATORS_H
+
+#include <algorithm>
+#include <cmath>
+#include <cstddef>
+#include <limits>
+#include <stdexcept>
+#include <tuple>
+#include <utility>
+#include <vector>
+
+// Streaming (incremental) indicators: O(1) work per new price.
+// Fed the same series one price at a time, each state reproduces the
+// element-wise output of its batch counterpart in indicators.h.
+// `update` commits a price; `peek` returns what `update` would, without committing.
+
+/// @brief Validates an indicator window.
+/// @throws std::invalid_argument if `window < 1`.
+inline int checked_window(int window) {
+    if (window < 1) {
+        throw std::invalid_argument("Indicator window must be >= 1");
+    }
+    return window;
+}
+
+/// @brief Incremental Relative Strength Index using Wilder's smoothing.
+/// @details The first `window` price changes seed the average gain/loss with a simple mean;
+/// afterwards each update applies \f$ avg_t = (avg_{t-1} \cdot (window - 1) + gain_t) / window \f$,
+/// the same expression as the batch kernel so both agree bit for bit.
+struct RsiState {
+    explicit RsiState(int window_size = 14) : window(checked_window(window_size)) {}
+
+    /// @brief Feeds a new price.
+    /// @param price Latest price.
+    /// @return RSI value, or NaN until `window` price changes have been seen.
+    double update(double price) {
+        constexpr double nan = std::numeric_limits<double>::quiet_NaN();
+
+        if (changes < 0) {
+            // First price: nothing to diff against yet
+            prev_price = price;
+            changes = 0;
+            return nan;
+        }
+
+        const double diff = price - prev_price;
+        const double gain = std::max(0.0, diff);
+        const double loss = std::max(0.0, -diff);
+        prev_price = price;
+        ++changes;
+
+        if (changes < window) {
+            avg_gain += gain;
+            avg_loss += loss;
+            return nan;
+        }
+        if (changes == window) {
+            avg_gain = (avg_gain + gain) / window;
+            avg_loss = (avg_loss + loss) / window;
+        } else {
+            avg_gain = (avg_gain * (window - 1) + gain) / window;
+            avg_loss = (avg_loss * (window - 1) + loss) / window;
+        }
+        return value();
+    }
+
+    /// @brief RSI if `price` were the next price, leaving the state untouched.
+    double peek(double price) const {
+        RsiState next = *this;
+        return next.update(price);
+    }
+
+    /// @brief Current RSI from the smoothed averages.
+    double value() const {
+        return (avg_loss == 0) ? 100.0 : 100.0 - (100.0 / (1.0 + avg_gain / avg_loss));
+    }
+
+    int window;
+    int changes = -1;  // Number of price changes seen (-1: no price yet)
+    double prev_price = 0.0;
+    double avg_gain = 0.0;
+    double avg_loss = 0.0;
+};
+
+/// @brief Incremental Bollinger Bands over a fixed window.
+/// @details Keeps the last `window` prices in a small ring together with their running
+/// sum and sum of squares, so each update is O(1): add the incoming price, subtract the evicted one.
+struct BollingerState {
+    explicit BollingerState(int window_size = 20, double k_mult = 2.0)
+        : window(checked_window(window_size)), k(k_mult), values(static_cast<size_t>(window), 0.0) {}
+
+    /// @brief Feeds a new price.
+    /// @param price Latest price.
+    /// @return True once the window is full and the bands are valid.
+    bool update(double price) {
+        double& slot = values[head];
+        if (filled == (size_t)window) {
+            sum -= slot;
+            sum_sq -= slot * slot;
+        } else {
+            ++filled;
+        }
+        slot = price;
+        sum += price;
+        sum_sq += price * price;
+        head = (head + 1) % values.size();
+
+        if (filled < (size_t)window) return false;
+
+        std::tie(upper, mid, lower) = bands(sum, sum_sq);
+        return true;
+    }
+
+    /// @brief Bands if `price` were the next price, leaving the state untouched.
+    /// @return (upper, mid, lower), NaN until the window would be full.
+    std::tuple<double, double, double> peek(double price) const {
+        constexpr double nan = std::numeric_limits<double>::quiet_NaN();
+        if (filled + 1 < (size_t)window) return {nan, nan, nan};
+
+        // Once full, values[head] is the oldest price: the one `update` would evict
+        const double evicted = (filled == (size_t)window) ? values[head] : 0.0;
+        return bands(sum - evicted + price, sum_sq - (evicted * evicted) + (price * price));
+    }
+
+    int window;
+    double k;
+    std::vector<double> values;
+    size_t head = 0;
+    size_t filled = 0;
+    double sum = 0.0;
+    double sum_sq = 0.0;
+    double upper = std::numeric_limits<double>::quiet_NaN();
+    double mid = std::numeric_limits<double>::quiet_NaN();
+    double lower = std::numeric_limits<double>::quiet_NaN();
+
+private:
+    std::tuple<double, double, double> bands(double s, double s_sq) const {
+        const double mean = s / window;
+        // Variance formula: (sum_sq - (sum^2 / N)) / N
+        const double variance = (s_sq - (s * s / window)) / window;
+        const double std_dev = std::sqrt(std::max(0.0, variance)); // std::max handles precision noise
+        return {mean + (k * std_dev), mean, mean - (k * std_dev)};
+    }
+};
+
+/// @brief Incremental Exponential Moving Average, seeded with the first price.
+struct EmaState {
+    explicit EmaState(int window_size = 20) : alpha(2.0 / (checked_window(window_size) + 1.0)) {}
+
+    /// @brief Feeds a new price.
+    /// @param price Latest price.
+    /// @return EMA value.
+    double update(double price) {
+        ema = peek(price);
+        started = true;
+        return ema;
+    }
+
+    /// @brief EMA if `price` were the next price, leaving the state untouched.
+    double peek(double price) const {
+        return started ? (price * alpha) + (ema * (1.0 - alpha)) : price;
+    }
+
+    double alpha;
+    double ema = 0.0;
+    bool started = false;
+};
+
+/// @brief Incremental MACD: fast EMA, slow EMA and the signal EMA of their difference.
+struct MacdState {
+    explicit MacdState(int fast_period = 12, int slow_period = 26, int signal_period = 9)
+        : fast(fast_period), slow(slow_period), signal(signal_period) {}
+
+    /// @brief Feeds a new price.
+    /// @param price Latest price.
+    /// @return (macd, signal) values.
+    std::tuple<double, double> update(double price) {
+        const double macd = fast.update(price) - slow.update(price);
+        return {macd, signal.update(macd)};
+    }
+
+    /// @brief (macd, signal) if `price` were the next price, leaving the state untouched.
+    std::tuple<double, double> peek(double price) const {
+        const double macd = fast.peek(price) - slow.peek(price);
+        return {macd, signal.peek(macd)};
+    }
+
+    EmaState fast;
+    EmaState slow;
+    EmaState signal;
+};
+
+/// @brief Candle-aware wrapper around a streaming indicator state.
+/// @details Keeps the committed state of the closed candles apart from the close of the
+/// candle still being formed (the tip). Replacing the tip costs one `peek`; appending a
+/// new candle first commits the previous tip with `update`. Either way it is O(1).
+/// @tparam State RsiState, EmaState, MacdState or BollingerState.
+template <typename State>
+class CandleIndicator {
+public:
+    using Value = decltype(std::declval<const State&>().peek(0.0));
+
+    explicit CandleIndicator(State initial) : initial_state(initial), state(std::move(initial)) {}
+
+    /// @brief Rebuilds the state from a price history whose last price is the forming candle.
+    /// @param prices Pointer to `size` contiguous prices, oldest first.
+    /// @param size Number of prices.
+    /// @param emit Called as `emit(i, value)` with the indicator value at every index.
+    template <typename Emit>
+    void warmup(const double* prices, size_t size, Emit&& emit) {
+        state = initial_state;
+        has_tip = false;
+        for (size_t i = 0; i < size; ++i) {
+            emit(i, update_last(prices[i], true));
+        }
+    }
+
+    /// @brief Updates the forming candle.
+    /// @param price Latest close.
+    /// @param append True when `price` opens a new candle (the previous tip is committed),
+    /// false when it replaces the close of the current one.
+    /// @return Indicator value at the tip.
+    Value update_last(double price, bool append) {
+        if (append && has_tip) {
+            state.update(tip);
+        }
+        tip = price;
+        has_tip = true;
+        return state.peek(tip);
+    }
+
+private:
+    State initial_state;
+    State state;
+    double tip = 0.0;
+    bool has_tip = false;
+};
+
+#endif // STREAMING_INDICATORS_H
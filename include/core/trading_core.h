@@ -11,55 +11,115 @@
 
 namespace py = pybind11;
 
+/// @brief C-contiguous float64 array. pybind11 converts (copies) only when the caller's
+/// array is not already contiguous float64, so kernels can read the buffer in place.
+using DoubleArray = py::array_t<double, py::array::c_style | py::array::forcecast>;
+
+/// @brief C-contiguous float32 array. No forcecast: only float32 input binds to it (float64
+/// is never silently narrowed), so float32 series reach the kernels without a float64 copy.
+using FloatArray = py::array_t<float, py::array::c_style>;
+
 /// @brief Calculates the Simple Moving Average (SMA) of the input data over a specified window.
 /// @details The SMA is calculated using a sliding window algorithm with O(n) complexity. 
 /// It maintains a running sum to avoid re-summing the entire window at each step.
 /// The formula used is: \f$ SMA = \frac{\sum_{i=1}^{n} P_i}{n} \f$.
+/// The result is written straight into a preallocated numpy array (no intermediate copies),
+/// with the GIL released while the kernel runs.
 /// @param input_data Input data as a numpy array.
 /// @param window Window size for the SMA calculation.
+/// @tparam T Output dtype: double for `calculate_sma`, float for `calculate_sma_f32`.
+/// @tparam Array Input array type: DoubleArray, or FloatArray for float32 series.
 /// @return SMA values as a numpy array.
-py::array_t<double> calculate_sma_cpp(const py::array_t<double> &input_data, const int &window);
+template <typename T = double, typename Array = DoubleArray>
+py::array_t<T> calculate_sma_cpp(const Array &input_data, const int &window);
 
 /// @brief Calculates the Exponential Moving Average (EMA) of the input data over a specified window.
 /// @details This implementation uses a recursive formula that gives more weight to recent prices.
 /// The smoothing factor is defined as \f$ \alpha = \frac{2}{window + 1} \f$.
 /// Formula: \f$ EMA_t = P_t \cdot \alpha + EMA_{t-1} \cdot (1 - \alpha) \f$.
+/// The GIL is released while the recurrence runs, so other Python threads keep going.
 /// @param input_data Input data as a numpy array.
 /// @param window Window size for the EMA calculation.
+/// @tparam T Output dtype (double or float).
+/// @tparam Array Input array type: DoubleArray, or FloatArray for float32 series.
 /// @return EMA values as a numpy array.
-py::array_t<double> calculate_ema_cpp(const py::array_t<double> &input_data, const int &window);
+template <typename T = double, typename Array = DoubleArray>
+py::array_t<T> calculate_ema_cpp(const Array &input_data, const int &window);
 
 /// @brief Calculates the Relative Strength Index (RSI) of the input data over a specified window.
 /// @details Uses Wilder's Smoothing Method for gains and losses. 
 /// @note The first window of data is used to initialize the averages, meaning the 
-/// first valid RSI value appears at index `window`.
+/// first valid RSI value appears at index `window`. The GIL is released while the kernel runs.
 /// @param input_data Input data as a numpy array.
 /// @param window Window size for the RSI calculation.
+/// @tparam T Output dtype (double or float).
+/// @tparam Array Input array type: DoubleArray, or FloatArray for float32 series.
 /// @return RSI values as a numpy array.
-py::array_t<double> calculate_rsi_cpp(const py::array_t<double> &input_data, const int &window);
+template <typename T = double, typename Array = DoubleArray>
+py::array_t<T> calculate_rsi_cpp(const Array &input_data, const int &window);
 
 /// @brief Calculates the Bollinger Bands of the input data over a specified window.
 /// @details Consists of a Middle Band (SMA) and two outer bands calculated using 
 /// standard deviation. This function uses a single-pass variance algorithm to 
-/// maintain O(n) efficiency.
+/// maintain O(n) efficiency; the three bands are written in the same pass, with the GIL released.
 /// Upper Band = \f$ SMA + (k \cdot \sigma) \f$, Lower Band = \f$ SMA - (k \cdot \sigma) \f$.
 /// @param input_data Input data as a numpy array.
 /// @param window Window size for the Bollinger Bands calculation.
 /// @param k Standard deviation multiplier.
+/// @tparam T Output dtype (double or float).
+/// @tparam Array Input array type: DoubleArray, or FloatArray for float32 series.
 /// @return Tuple of (upper_band, middle_band, lower_band) as numpy arrays.
-std::tuple<py::array_t<double>, py::array_t<double>, py::array_t<double>>
-calculate_bollinger_bands_cpp(const py::array_t<double> &input_data, const int &window, const double &k);
+template <typename T = double, typename Array = DoubleArray>
+std::tuple<py::array_t<T>, py::array_t<T>, py::array_t<T>>
+calculate_bollinger_bands_cpp(const Array &input_data, const int &window, const double &k);
 
 /// @brief Calculates the Moving Average Convergence Divergence (MACD) of the input data.
 /// @details The MACD is the difference between a Fast EMA and a Slow EMA. 
-/// The Signal line is an EMA of the MACD line itself.
+/// The Signal line is an EMA of the MACD line itself. All three EMAs are advanced
+/// in a single pass over the input, with the GIL released.
 /// @param input_data Input data as a numpy array.
 /// @param fast Fast EMA window size.
 /// @param slow Slow EMA window size.
 /// @param signal Signal line EMA window size.
+/// @tparam T Output dtype (double or float).
+/// @tparam Array Input array type: DoubleArray, or FloatArray for float32 series.
 /// @return Tuple of (macd_line, signal_line) as numpy arrays.
-std::tuple<py::array_t<double>, py::array_t<double>>
-calculate_macd_cpp(const py::array_t<double> &input_data, const int &fast, const int &slow, const int &signal);
+template <typename T = double, typename Array = DoubleArray>
+std::tuple<py::array_t<T>, py::array_t<T>>
+calculate_macd_cpp(const Array &input_data, const int &fast, const int &slow, const int &signal);
+
+/// @brief Calculates RSI, MACD and Bollinger Bands in a single fused pass.
+/// @details Equivalent to calling calculate_rsi_cpp, calculate_macd_cpp and
+/// calculate_bollinger_bands_cpp on the same input, but the input is streamed once,
+/// arguments are parsed once and the GIL is released once.
+/// @param input_data Input data as a numpy array.
+/// @param rsi_window Window size for the RSI calculation.
+/// @param bb_window Window size for the Bollinger Bands calculation.
+/// @param bb_k Standard deviation multiplier.
+/// @param macd_fast Fast EMA window size.
+/// @param macd_slow Slow EMA window size.
+/// @param macd_signal Signal line EMA window size.
+/// @tparam T Output dtype (double or float).
+/// @tparam Array Input array type: DoubleArray, or FloatArray for float32 series.
+/// @return Tuple of (rsi, macd_line, signal_line, upper_band, middle_band, lower_band).
+template <typename T = double, typename Array = DoubleArray>
+std::tuple<py::array_t<T>, py::array_t<T>, py::array_t<T>,
+           py::array_t<T>, py::array_t<T>, py::array_t<T>>
+calculate_all_cpp(const Array &input_data, const int &rsi_window, const int &bb_window,
+                  const double &bb_k, const int &macd_fast, const int &macd_slow,
+                  const int &macd_signal);
+
+/// @brief Computes the backtest equity curves for a close series and a position series.
+/// @details Single fused pass producing market returns, strategy returns (position of the
+/// previous bar times the market return), both cumulative return curves and the drawdown
+/// of the strategy curve from its running maximum. The first element of every output is NaN.
+/// @param close Close prices as a numpy array.
+/// @param signal Positions as a numpy array (1 long, -1 short, 0 flat); same length as `close`.
+/// @return Tuple of (market_returns, strategy_returns, cum_market_returns,
+/// cum_strategy_returns, drawdown) as numpy arrays.
+std::tuple<py::array_t<double>, py::array_t<double>, py::array_t<double>,
+           py::array_t<double>, py::array_t<double>>
+calculate_backtest_returns_cpp(const DoubleArray &close, const DoubleArray &signal);
 
 /// @brief Checks trading signals based on RSI and Bollinger Bands.
 /// @details This is a trend-reversal strategy signal generator.
@@ -91,6 +91,13 @@ EXTRAS_REQUIRE = {
 # All extras combined
 EXTRAS_REQUIRE["all"] = list(set(sum(EXTRAS_REQUIRE.values(), [])))
 
+# Command-line tools (mirrors [project.scripts] in pyproject.toml)
+ENTRY_POINTS = {
+    "console_scripts": [
+        "trading-bot=trading_bot.monitor:main",
+    ],
+}
+
 # ============================================================================
 # Build Configuration
 # ============================================================================
@@ -120,6 +127,7 @@ if USE_SCIKIT_BUILD:
         cmake_install_dir="trading_bot",  # Install C++ module here
         install_requires=INSTALL_REQUIRES,
         extras_require=EXTRAS_REQUIRE,
+        entry_points=ENTRY_POINTS,
         python_requires=">=3.10",
         classifiers=[
             "Development Status :: 3 - Alpha",
@@ -163,7 +171,7 @@ else:
             # CMake configuration arguments
             cmake_args = [
                 f"-DCMAKE_LIBRARY_OUTPUT_DIRECTORY={extdir}",
-                f"-DPYTHON_EXECUTABLE={sys.executable}",
+                f"-DPython_EXECUTABLE={sys.executable}",
                 f"-DCMAKE_BUILD_TYPE={'Debug' if self.debug else 'Release'}",
             ]
 
@@ -212,6 +220,7 @@ else:
         cmdclass={"build_ext": CMakeBuild},
         install_requires=INSTALL_REQUIRES,
         extras_require=EXTRAS_REQUIRE,
+        entry_points=ENTRY_POINTS,
         python_requires=">=3.10",
         classifiers=[
             "Development Status :: 3 - Alpha",
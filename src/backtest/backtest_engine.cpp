@@ -18,9 +18,24 @@ void BacktestEngine::run() {
     running_ = true;
     Logger::log(LogLevel::INFO, "Starting Backtest Engine Loop...");
 
-    while (running_ && !queue_->empty()) {
-        Event event = queue_->pop();
-        handle_event(event);
+    const size_t tape_size = tape_ ? tape_->size() : 0;
+    size_t cursor = 0;
+
+    while (running_) {
+        // Next source in time order; on equal timestamps the tape tick goes
+        // first so orders at that instant see the latest market data
+        int64_t next_queued = 0;
+        const bool has_queued = queue_->peek_timestamp(next_queued);
+        const bool has_tape = cursor < tape_size;
+
+        if (has_tape && (!has_queued || tape_->timestamp(cursor) <= next_queued)) {
+            execution_engine_->on_tick(*tape_, cursor++);
+        } else if (has_queued) {
+            Event event = queue_->pop();
+            handle_event(event);
+        } else {
+            break;
+        }
         events_processed_++;
     }
 
@@ -39,6 +54,10 @@ void BacktestEngine::push_event(const Event& event) {
     queue_->push(event);
 }
 
+void BacktestEngine::set_tick_tape(std::shared_ptr<const TickTape> tape) {
+    tape_ = std::move(tape);
+}
+
 void BacktestEngine::handle_event(const Event& event) {
     std::visit(
         [this](auto&& arg) {
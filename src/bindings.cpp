@@ -4,15 +4,20 @@
 #include <pybind11/stl.h>
 
 #include <cstdint>
+#include <stdexcept>
 #include <string>
+#include <tuple>
 #include <utility>
+#include <vector>
 
 #include "backtest/backtest_engine.h"
 #include "backtest/event_queue.h"
 #include "backtest/execution_engine.h"
+#include "backtest/tick_tape.h"
 #include "core/events.h"
 #include "core/indicators.h"
 #include "core/market_manager.h"
+#include "core/streaming_indicators.h"
 #include "core/trading_core.h"
 #include "utils/logger.h"
 
@@ -28,6 +33,25 @@ int64_t timestamp_to_nanos(const Timestamp& ts) {
 Timestamp nanos_to_timestamp(int64_t nanos) {
     return make_timestamp(nanos);
 }
+
+using RsiStream = CandleIndicator<RsiState>;
+using EmaStream = CandleIndicator<EmaState>;
+using MacdStream = CandleIndicator<MacdState>;
+using BollingerStream = CandleIndicator<BollingerState>;
+
+/// @brief Warm-up for single-valued streams (RSI, EMA): one output array.
+template <typename Stream>
+py::array_t<double> warmup_single(Stream& self, const DoubleArray& prices) {
+    py::array_t<double> out(prices.size());
+    const double* in = prices.data();
+    double* o = out.mutable_data();
+    {
+        py::gil_scoped_release release;
+        self.warmup(in, static_cast<size_t>(prices.size()),
+                    [o](size_t i, double value) { o[i] = value; });
+    }
+    return out;
+}
 } // namespace
 
 /// @brief Macro of Pybind11 which defines module `trading_core`.
@@ -53,7 +77,7 @@ PYBIND11_MODULE(trading_core, m) {
     // --- Indicators ---
 
     m.def("calculate_sma",
-          &calculate_sma_cpp,
+          &calculate_sma_cpp<double>,
           "Calculates the Simple Moving Average (SMA).\n\n"
           "Args:\n"
           "    input_data (np.ndarray): Array of price data.\n"
@@ -64,7 +88,7 @@ PYBIND11_MODULE(trading_core, m) {
           py::arg("window"));
 
     m.def("calculate_ema",
-          &calculate_ema_cpp,
+          &calculate_ema_cpp<double>,
           "Calculates the Exponential Moving Average (EMA).\n\n"
           "Args:\n"
           "    input_data (np.ndarray): Array of price data.\n"
@@ -75,7 +99,7 @@ PYBIND11_MODULE(trading_core, m) {
           py::arg("window"));
 
     m.def("calculate_rsi",
-          &calculate_rsi_cpp,
+          &calculate_rsi_cpp<double>,
           "Calculates the Relative Strength Index (RSI) using Wilder's smoothing.\n\n"
           "Args:\n"
           "    input_data (np.ndarray): Array of price data.\n"
@@ -86,7 +110,7 @@ PYBIND11_MODULE(trading_core, m) {
           py::arg("window") = 14);
 
     m.def("calculate_macd",
-          &calculate_macd_cpp,
+          &calculate_macd_cpp<double>,
           "Calculates MACD Line and Signal Line.\n\n"
           "Args:\n"
           "    input_data (np.ndarray): Price series.\n"
@@ -101,7 +125,7 @@ PYBIND11_MODULE(trading_core, m) {
           py::arg("signal") = 9);
 
     m.def("calculate_bollinger_bands",
-          &calculate_bollinger_bands_cpp,
+          &calculate_bollinger_bands_cpp<double>,
           "Calculates Bollinger Bands (Upper, Middle, Lower).\n\n"
           "Args:\n"
           "    input_data (np.ndarray): Price series.\n"
@@ -113,6 +137,134 @@ PYBIND11_MODULE(trading_core, m) {
           py::arg("window") = 20,
           py::arg("k") = 2.0);
 
+    m.def("calculate_all",
+          &calculate_all_cpp<double>,
+          "Calculates RSI, MACD and Bollinger Bands in a single pass over the input.\n\n"
+          "Same values as the separate calculate_* functions, for a third of the\n"
+          "memory traffic and call overhead.\n\n"
+          "Args:\n"
+          "    input_data (np.ndarray): Price series.\n"
+          "    rsi_window (int): RSI lookback (default 14).\n"
+          "    bb_window (int): Bollinger Bands lookback (default 20).\n"
+          "    bb_k (float): Standard deviation multiplier (default 2.0).\n"
+          "    macd_fast (int): Fast EMA window (default 12).\n"
+          "    macd_slow (int): Slow EMA window (default 26).\n"
+          "    macd_signal (int): Signal line EMA window (default 9).\n\n"
+          "Returns:\n"
+          "    tuple: (rsi, macd_line, signal_line, upper_band, middle_band, lower_band).",
+          py::arg("input_data"),
+          py::arg("rsi_window") = 14,
+          py::arg("bb_window") = 20,
+          py::arg("bb_k") = 2.0,
+          py::arg("macd_fast") = 12,
+          py::arg("macd_slow") = 26,
+          py::arg("macd_signal") = 9);
+
+    // float32 outputs: same kernels (accumulating in double), half the bytes per value.
+    // Each takes float32 input as is (first overload) or float64 input (second). The float32
+    // overload is noconvert: lists and other dtypes must reach the float64 one, not be
+    // narrowed to float32 on pybind11's conversion pass.
+
+    m.def("calculate_sma_f32",
+          &calculate_sma_cpp<float, FloatArray>,
+          "float32 input overload: the series is read in place, without a float64 copy.",
+          py::arg("input_data").noconvert(),
+          py::arg("window"));
+
+    m.def("calculate_sma_f32",
+          &calculate_sma_cpp<float>,
+          "Same as calculate_sma, returning a float32 array.",
+          py::arg("input_data"),
+          py::arg("window"));
+
+    m.def("calculate_ema_f32",
+          &calculate_ema_cpp<float, FloatArray>,
+          "float32 input overload: the series is read in place, without a float64 copy.",
+          py::arg("input_data").noconvert(),
+          py::arg("window"));
+
+    m.def("calculate_ema_f32",
+          &calculate_ema_cpp<float>,
+          "Same as calculate_ema, returning a float32 array.",
+          py::arg("input_data"),
+          py::arg("window"));
+
+    m.def("calculate_rsi_f32",
+          &calculate_rsi_cpp<float, FloatArray>,
+          "float32 input overload: the series is read in place, without a float64 copy.",
+          py::arg("input_data").noconvert(),
+          py::arg("window") = 14);
+
+    m.def("calculate_rsi_f32",
+          &calculate_rsi_cpp<float>,
+          "Same as calculate_rsi, returning a float32 array.",
+          py::arg("input_data"),
+          py::arg("window") = 14);
+
+    m.def("calculate_macd_f32",
+          &calculate_macd_cpp<float, FloatArray>,
+          "float32 input overload: the series is read in place, without a float64 copy.",
+          py::arg("input_data").noconvert(),
+          py::arg("fast") = 12,
+          py::arg("slow") = 26,
+          py::arg("signal") = 9);
+
+    m.def("calculate_macd_f32",
+          &calculate_macd_cpp<float>,
+          "Same as calculate_macd, returning float32 arrays.",
+          py::arg("input_data"),
+          py::arg("fast") = 12,
+          py::arg("slow") = 26,
+          py::arg("signal") = 9);
+
+    m.def("calculate_bollinger_bands_f32",
+          &calculate_bollinger_bands_cpp<float, FloatArray>,
+          "float32 input overload: the series is read in place, without a float64 copy.",
+          py::arg("input_data").noconvert(),
+          py::arg("window") = 20,
+          py::arg("k") = 2.0);
+
+    m.def("calculate_bollinger_bands_f32",
+          &calculate_bollinger_bands_cpp<float>,
+          "Same as calculate_bollinger_bands, returning float32 arrays.",
+          py::arg("input_data"),
+          py::arg("window") = 20,
+          py::arg("k") = 2.0);
+
+    m.def("calculate_all_f32",
+          &calculate_all_cpp<float, FloatArray>,
+          "float32 input overload: the series is read in place, without a float64 copy.",
+          py::arg("input_data").noconvert(),
+          py::arg("rsi_window") = 14,
+          py::arg("bb_window") = 20,
+          py::arg("bb_k") = 2.0,
+          py::arg("macd_fast") = 12,
+          py::arg("macd_slow") = 26,
+          py::arg("macd_signal") = 9);
+
+    m.def("calculate_all_f32",
+          &calculate_all_cpp<float>,
+          "Same as calculate_all, returning float32 arrays.",
+          py::arg("input_data"),
+          py::arg("rsi_window") = 14,
+          py::arg("bb_window") = 20,
+          py::arg("bb_k") = 2.0,
+          py::arg("macd_fast") = 12,
+          py::arg("macd_slow") = 26,
+          py::arg("macd_signal") = 9);
+
+    m.def("calculate_backtest_returns",
+          &calculate_backtest_returns_cpp,
+          "Computes backtest returns, equity curves and drawdown in a single pass.\n\n"
+          "Args:\n"
+          "    close (np.ndarray): Close prices.\n"
+          "    signal (np.ndarray): Positions (1 long, -1 short, 0 flat), same length.\n\n"
+          "Returns:\n"
+          "    tuple: (market_returns, strategy_returns, cum_market_returns,\n"
+          "           cum_strategy_returns, drawdown). Index 0 is NaN.",
+          py::arg("close"),
+          py::arg("signal"));
+
     m.def("check_signals",
           &check_signals_cpp,
           "Detects basic oversold/overbought signals based on RSI and Bollinger Bands.\n\n"
@@ -123,8 +275,112 @@ PYBIND11_MODULE(trading_core, m) {
           py::arg("bb_upper"),
           py::arg("bb_lower"));
 
+    // --- Streaming indicators (forming-candle aware) ---
+
+    py::class_<RsiStream>(m, "RsiStream",
+                          "Incremental RSI over candles: closed candles are committed, the\n"
+                          "forming one is re-evaluated in O(1) on every update.")
+        .def(py::init([](int window) { return RsiStream(RsiState(window)); }),
+             py::arg("window") = 14)
+        .def("warmup",
+             &warmup_single<RsiStream>,
+             "Rebuilds the state from a close history (last close = forming candle).\n\n"
+             "Returns:\n"
+             "    np.ndarray: Same values as calculate_rsi(close_prices, window).",
+             py::arg("close_prices"))
+        .def("update_last",
+             &RsiStream::update_last,
+             "Updates the forming candle and returns the RSI at the tip.\n\n"
+             "Args:\n"
+             "    close (float): Latest close.\n"
+             "    append (bool): True if it opens a new candle, False to replace the current close.",
+             py::arg("close"),
+             py::arg("append") = false);
+
+    py::class_<EmaStream>(m, "EmaStream", "Incremental EMA over candles (see RsiStream).")
+        .def(py::init([](int window) { return EmaStream(EmaState(window)); }),
+             py::arg("window"))
+        .def("warmup",
+             &warmup_single<EmaStream>,
+             "Rebuilds the state from a close history; returns calculate_ema's values.",
+             py::arg("close_prices"))
+        .def("update_last",
+             &EmaStream::update_last,
+             "Updates the forming candle and returns the EMA at the tip.",
+             py::arg("close"),
+             py::arg("append") = false);
+
+    py::class_<MacdStream>(m, "MacdStream", "Incremental MACD over candles (see RsiStream).")
+        .def(py::init([](int fast, int slow, int signal) { return MacdStream(MacdState(fast, slow, signal)); }),
+             py::arg("fast") = 12,
+             py::arg("slow") = 26,
+             py::arg("signal") = 9)
+        .def("warmup",
+             [](MacdStream& self, const DoubleArray& prices) {
+                 py::array_t<double> macd_line(prices.size());
+                 py::array_t<double> signal_line(prices.size());
+                 const double* in = prices.data();
+                 double* macd_out = macd_line.mutable_data();
+                 double* signal_out = signal_line.mutable_data();
+                 {
+                     py::gil_scoped_release release;
+                     self.warmup(in, static_cast<size_t>(prices.size()),
+                                 [=](size_t i, const std::tuple<double, double>& value) {
+                                     std::tie(macd_out[i], signal_out[i]) = value;
+                                 });
+                 }
+                 return std::make_tuple(macd_line, signal_line);
+             },
+             "Rebuilds the state from a close history; returns calculate_macd's (macd_line, signal_line).",
+             py::arg("close_prices"))
+        .def("update_last",
+             &MacdStream::update_last,
+             "Updates the forming candle and returns (macd, signal) at the tip.",
+             py::arg("close"),
+             py::arg("append") = false);
+
+    py::class_<BollingerStream>(m, "BollingerStream", "Incremental Bollinger Bands over candles (see RsiStream).")
+        .def(py::init([](int window, double k) { return BollingerStream(BollingerState(window, k)); }),
+             py::arg("window") = 20,
+             py::arg("k") = 2.0)
+        .def("warmup",
+             [](BollingerStream& self, const DoubleArray& prices) {
+                 py::array_t<double> upper(prices.size());
+                 py::array_t<double> mid(prices.size());
+                 py::array_t<double> lower(prices.size());
+                 const double* in = prices.data();
+                 double* upper_out = upper.mutable_data();
+                 double* mid_out = mid.mutable_data();
+                 double* lower_out = lower.mutable_data();
+                 {
+                     py::gil_scoped_release release;
+                     self.warmup(in, static_cast<size_t>(prices.size()),
+                                 [=](size_t i, const std::tuple<double, double, double>& value) {
+                                     std::tie(upper_out[i], mid_out[i], lower_out[i]) = value;
+                                 });
+                 }
+                 return std::make_tuple(upper, mid, lower);
+             },
+             "Rebuilds the state from a close history; returns calculate_bollinger_bands' (upper, middle, lower).",
+             py::arg("close_prices"))
+        .def("update_last",
+             &BollingerStream::update_last,
+             "Updates the forming candle and returns (upper, middle, lower) at the tip.",
+             py::arg("close"),
+             py::arg("append") = false);
+
     // --- Market Manager ---
 
+    py::class_<IndicatorSnapshot>(m, "IndicatorSnapshot",
+                                  "Indicator values at the latest update processed for a symbol.")
+        .def_readonly("price", &IndicatorSnapshot::price)
+        .def_readonly("rsi", &IndicatorSnapshot::rsi)
+        .def_readonly("upper", &IndicatorSnapshot::upper)
+        .def_readonly("mid", &IndicatorSnapshot::mid)
+        .def_readonly("lower", &IndicatorSnapshot::lower)
+        .def_readonly("signal", &IndicatorSnapshot::signal)
+        .def_readonly("count", &IndicatorSnapshot::count);
+
     py::class_<MarketManager>(m, "MarketManager", "Orchestrator for parallel market data processing.")
         .def(py::init<size_t>(),
              "Initializes the manager with a thread pool.\n\n"
@@ -132,17 +388,126 @@ PYBIND11_MODULE(trading_core, m) {
              "    num_threads (int): Number of background worker threads.",
              py::arg("num_threads") = 4)
         .def("update_tick",
-             &MarketManager::update_tick,
+             [](MarketManager& self, const std::string& symbol, double price) {
+                 // Fast path keeps the GIL; only a full ring waits, and that wait must
+                 // not hold the GIL the workers' log callback needs to drain it
+                 if (!self.try_update_tick(symbol, price)) {
+                     py::gil_scoped_release release;
+                     self.update_tick(symbol, price);
+                 }
+             },
              "Dispatches a new price tick to the thread pool for analysis.\n\n"
+             "Ticks are queued in a per-symbol lock-free ring and processed in order.\n\n"
              "Args:\n"
              "    symbol (str): The ticker symbol (e.g., 'BTC/USDT').\n"
              "    price (float): The current market price.",
              py::arg("symbol"),
              py::arg("price"))
+        .def("register_symbol",
+             &MarketManager::register_symbol,
+             "Interns a symbol and returns its integer id (stable for this manager).\n\n"
+             "The *_id update methods take this id instead of the symbol string,\n"
+             "skipping the string conversion and hash lookup on every tick.",
+             py::arg("symbol"))
+        .def("update_tick_id",
+             [](MarketManager& self, uint16_t id, double price) {
+                 if (!self.try_update_tick_id(id, price)) {
+                     py::gil_scoped_release release;
+                     self.update_tick_id(id, price);
+                 }
+             },
+             "update_tick for a symbol id returned by register_symbol.",
+             py::arg("symbol_id"),
+             py::arg("price"))
+        .def("update_candle_id",
+             [](MarketManager& self, uint16_t id, int64_t timestamp, double close) {
+                 if (!self.try_update_candle_id(id, timestamp, close)) {
+                     py::gil_scoped_release release;
+                     self.update_candle_id(id, timestamp, close);
+                 }
+             },
+             "update_candle for a symbol id returned by register_symbol.",
+             py::arg("symbol_id"),
+             py::arg("timestamp"),
+             py::arg("close"))
+        .def("update_candles_id",
+             [](MarketManager& self, const std::vector<std::tuple<uint16_t, int64_t, double>>& batch) {
+                 std::vector<CandleUpdate> updates;
+                 updates.reserve(batch.size());
+                 for (const auto& [id, timestamp, close] : batch) {
+                     updates.push_back(CandleUpdate{id, timestamp, close});
+                 }
+                 py::gil_scoped_release release;
+                 self.update_candles_id(updates.data(), updates.size());
+             },
+             "Dispatches a batch of candle updates for any mix of symbols in a single call\n"
+             "(GIL released once). Updates of the same symbol keep their order.\n\n"
+             "Args:\n"
+             "    batch (list[tuple[int, int, float]]): (symbol_id, timestamp, close) entries,\n"
+             "        with ids returned by register_symbol.",
+             py::arg("batch"))
+        .def("update_ticks",
+             [](MarketManager& self, const std::string& symbol, const DoubleArray& prices) {
+                 const double* data = prices.data();
+                 const auto count = static_cast<size_t>(prices.size());
+                 py::gil_scoped_release release;
+                 self.update_ticks(symbol, data, count);
+             },
+             "Dispatches a batch of ticks for one symbol in a single call (GIL released once).\n\n"
+             "Args:\n"
+             "    symbol (str): The ticker symbol (e.g., 'BTC/USDT').\n"
+             "    prices (np.ndarray): Prices in arrival order.",
+             py::arg("symbol"),
+             py::arg("prices"))
+        .def("update_ticks_multi",
+             [](MarketManager& self, const std::unordered_map<std::string, DoubleArray>& batches) {
+                 // Converted (and kept alive) with the GIL held; only raw buffers cross the release
+                 py::gil_scoped_release release;
+                 for (const auto& [symbol, prices] : batches) {
+                     self.update_ticks(symbol, prices.data(), static_cast<size_t>(prices.size()));
+                 }
+             },
+             "Dispatches batches of ticks for several symbols in a single call.\n\n"
+             "Args:\n"
+             "    batches (dict[str, np.ndarray]): Prices in arrival order, per symbol.",
+             py::arg("batches"))
+        .def("update_candle",
+             [](MarketManager& self, const std::string& symbol, int64_t timestamp, double close) {
+                 if (!self.try_update_candle(symbol, timestamp, close)) {
+                     py::gil_scoped_release release;
+                     self.update_candle(symbol, timestamp, close);
+                 }
+             },
+             "Dispatches an update of the candle being formed to the thread pool.\n\n"
+             "Updates with the same open time replace the forming candle and only\n"
+             "re-evaluate the indicator tip in O(1); a newer open time commits the\n"
+             "previous candle to the indicators.\n\n"
+             "Args:\n"
+             "    symbol (str): The ticker symbol (e.g., 'BTC/USDT').\n"
+             "    timestamp (int): Candle open time in epoch milliseconds.\n"
+             "    close (float): Current close price of that candle.",
+             py::arg("symbol"),
+             py::arg("timestamp"),
+             py::arg("close"))
         .def("get_last_price",
              &MarketManager::get_last_price,
              "Thread-safe retrieval of the last stored price for a symbol.",
-             py::arg("symbol"));
+             py::arg("symbol"))
+        .def("get_indicators",
+             &MarketManager::get_indicators,
+             "Indicator values at the latest processed update of a symbol, for debugging\n"
+             "(current for every queued update once wait_until_idle returns True).",
+             py::arg("symbol"))
+        .def("wait_until_idle",
+             &MarketManager::wait_until_idle,
+             py::call_guard<py::gil_scoped_release>(),
+             "Blocks until every queued update has been processed (the GIL is released\n"
+             "meanwhile, so log callbacks keep running).\n\n"
+             "Args:\n"
+             "    timeout (float): Maximum wait in seconds.\n\n"
+             "Returns:\n"
+             "    bool: False if updates were still pending at the timeout.",
+             py::arg("timeout") = 1.0);
 
     // --- Events ---
 
@@ -321,18 +686,38 @@ PYBIND11_MODULE(trading_core, m) {
         .def("size", &EventQueue::size)
         .def("stop", &EventQueue::stop);
 
+    py::enum_<SlippageKind>(m_bt, "SlippageKind", "Built-in slippage models evaluated in C++.")
+        .value("FixedOffset", SlippageKind::FixedOffset)
+        .value("Linear", SlippageKind::Linear)
+        .value("SqrtImpact", SlippageKind::SqrtImpact)
+        .value("Callback", SlippageKind::Callback);
+
     py::class_<ExecutionEngine, std::shared_ptr<ExecutionEngine>>(m_bt, "ExecutionEngine")
         .def(py::init<EventQueue&, SlippageModel>(),
              py::arg("event_queue"),
              py::arg("slippage_model"),
              py::keep_alive<1, 2>())
+        .def(py::init<EventQueue&, SlippageKind, double>(),
+             "Uses a built-in slippage model; fills never call back into Python.\n\n"
+             "Args:\n"
+             "    event_queue (EventQueue): Queue receiving the fills.\n"
+             "    kind (SlippageKind): FixedOffset, Linear or SqrtImpact.\n"
+             "    coefficient (float): Price offset (FixedOffset) or impact coefficient.",
+             py::arg("event_queue"),
+             py::arg("kind"),
+             py::arg("coefficient") = 0.0,
+             py::keep_alive<1, 2>())
         .def("get_fills", &ExecutionEngine::getFillsHistory);
 
     py::class_<BacktestEngine, std::shared_ptr<BacktestEngine>>(m_bt, "BacktestEngine")
         .def(py::init<std::shared_ptr<EventQueue>, std::shared_ptr<ExecutionEngine>>(),
              py::arg("event_queue"),
              py::arg("execution_engine"))
-        .def("run", &BacktestEngine::run)
+        .def("run",
+             &BacktestEngine::run,
+             // Pure C++ loop: Python slippage models and the log callback re-acquire the GIL
+             py::call_guard<py::gil_scoped_release>(),
+             "Processes queued events (and the tick tape, if any) until the queue is empty.")
         .def("stop", &BacktestEngine::stop)
         .def("push_event", [](BacktestEngine& self, const TickEvent& event) {
             self.push_event(Event{event});
@@ -346,5 +731,88 @@ PYBIND11_MODULE(trading_core, m) {
         .def("push_event", [](BacktestEngine& self, const FillEvent& event) {
             self.push_event(Event{event});
         })
-        .def("get_queue", &BacktestEngine::getQueue);
+        .def("get_queue", &BacktestEngine::getQueue)
+        .def("set_tick_tape",
+             [](BacktestEngine& self, std::shared_ptr<TickTape> tape) { self.set_tick_tape(std::move(tape)); },
+             "Replays the tape's ticks during run(), merged with queued events by timestamp.",
+             py::arg("tape"));
+
+    py::class_<TickTape, std::shared_ptr<TickTape>>(
+        m_bt, "TickTape",
+        "Columnar store of historical ticks (one array per field, interned symbols).")
+        .def(py::init<>())
+        .def("intern",
+             &TickTape::intern,
+             "Returns the integer id of a symbol, adding it on first use.",
+             py::arg("symbol"))
+        .def("append_tick",
+             [](TickTape& self, int64_t timestamp, const std::string& symbol,
+                double bid, double ask, double bid_volume, double ask_volume,
+                double last, double last_volume) {
+                 self.append_tick(timestamp, self.intern(symbol), bid, ask,
+                                  bid_volume, ask_volume, last, last_volume);
+             },
+             "Appends one tick (timestamps must be non-decreasing).",
+             py::arg("timestamp"),
+             py::arg("symbol"),
+             py::arg("bid"),
+             py::arg("ask"),
+             py::arg("bid_volume"),
+             py::arg("ask_volume"),
+             py::arg("last"),
+             py::arg("last_volume"))
+        .def("extend",
+             [](TickTape& self,
+                const py::array_t<int64_t, py::array::c_style | py::array::forcecast>& timestamps,
+                const py::array_t<uint32_t, py::array::c_style | py::array::forcecast>& symbol_ids,
+                const DoubleArray& bid, const DoubleArray& ask,
+                const DoubleArray& bid_volume, const DoubleArray& ask_volume,
+                const DoubleArray& last, const DoubleArray& last_volume) {
+                 const auto n = timestamps.size();
+                 for (const auto size : {symbol_ids.size(), bid.size(), ask.size(), bid_volume.size(),
+                                         ask_volume.size(), last.size(), last_volume.size()}) {
+                     if (size != n) {
+                         throw std::invalid_argument("TickTape.extend: all columns must have the same length");
+                     }
+                 }
+                 const int64_t* ts = timestamps.data();
+                 const uint32_t* ids = symbol_ids.data();
+                 const double* bids = bid.data();
+                 const double* asks = ask.data();
+                 const double* bid_vols = bid_volume.data();
+                 const double* ask_vols = ask_volume.data();
+                 const double* lasts = last.data();
+                 const double* last_vols = last_volume.data();
+
+                 py::gil_scoped_release release;
+                 self.extend(static_cast<size_t>(n), ts, ids, bids, asks, bid_vols, ask_vols,
+                             lasts, last_vols);
+             },
+             "Bulk-appends ticks from numpy columns (symbol ids come from intern()).\n"
+             "All rows are validated first: on error the tape is left unchanged.",
+             py::arg("timestamps"),
+             py::arg("symbol_ids"),
+             py::arg("bid"),
+             py::arg("ask"),
+             py::arg("bid_volume"),
+             py::arg("ask_volume"),
+             py::arg("last"),
+             py::arg("last_volume"))
+        .def("symbols",
+             [](const TickTape& self) { return self.symbols().names(); },
+             "Interned symbols, indexed by id.")
+        .def("__len__", &TickTape::size)
+        .def("__getitem__",
+             [](const TickTape& self, py::ssize_t i) {
+                 const auto n = static_cast<py::ssize_t>(self.size());
+                 if (i < 0) {
+                     i += n;
+                 }
+                 if (i < 0 || i >= n) {
+                     throw py::index_error("TickTape index out of range");
+                 }
+                 return self.event(static_cast<size_t>(i));
+             },
+             "Row `i` as a TickEvent.",
+             py::arg("i"));
 }
\ No newline at end of file
@@ -1,124 +1,245 @@
 #include "core/indicators.h"
 
+#include <type_traits>
+
+#if defined(__AVX2__) && defined(__FMA__)
+#include <immintrin.h>
+#endif
+
+namespace {
+
+// Standard windows: the kernels run a copy compiled with these as constants (fixed loop
+// bounds and divisors); any other window takes the runtime-window path
+constexpr int standard_rsi_window = 14;
+constexpr int standard_bb_window = 20;
+
+/// @brief Sum and sum of squares of `n` contiguous values (seed of the sliding-window kernels).
+/// @details AVX2/FMA builds reduce four values per step (float inputs are widened first,
+/// the accumulators always hold doubles); other targets use the scalar loop.
+template <typename In>
+void window_sums(const In* input, size_t n, double& sum, double& sum_sq) {
+    size_t i = 0;
+    sum = 0.0;
+    sum_sq = 0.0;
+
+#if defined(__AVX2__) && defined(__FMA__)
+    __m256d vsum = _mm256_setzero_pd();
+    __m256d vsq = _mm256_setzero_pd();
+    const size_t vec_end = n & ~size_t{3}; // Whole 4-lane blocks
+    for (; i < vec_end; i += 4) {
+        __m256d v;
+        if constexpr (std::is_same_v<In, float>) {
+            v = _mm256_cvtps_pd(_mm_loadu_ps(input + i));
+        } else {
+            v = _mm256_loadu_pd(input + i);
+        }
+        vsum = _mm256_add_pd(vsum, v);
+        vsq = _mm256_fmadd_pd(v, v, vsq);
+    }
+    // Horizontal reduction: hadd pairs lanes (0+1, 2+3) of both vectors at once
+    const __m256d pairs = _mm256_hadd_pd(vsum, vsq);
+    const __m128d halves = _mm_add_pd(_mm256_castpd256_pd128(pairs), _mm256_extractf128_pd(pairs, 1));
+    sum = _mm_cvtsd_f64(halves);
+    sum_sq = _mm_cvtsd_f64(_mm_unpackhi_pd(halves, halves));
+#endif
+
+    // Tail (or the whole window without AVX2)
+    for (; i < n; ++i) {
+        const double x = input[i];
+        sum += x;
+        sum_sq += x * x;
+    }
+}
+
+} // namespace
+
 /// @brief Calculates the Simple Moving Average (SMA) of the input data over a specified window.
 std::vector<double> compute_sma(const std::vector<double>& input, const int& window) {
-    const size_t size = input.size();
-    constexpr double nan = std::numeric_limits<double>::quiet_NaN();
-    std::vector<double> result(size, nan);
+    std::vector<double> result(input.size());
+    compute_sma(input.data(), input.size(), window, result.data());
+    return result;
+}
+
+/// @brief Raw-buffer SMA kernel: writes directly into a caller-owned output buffer.
+template <typename In, typename T>
+void compute_sma(const In* input, size_t size, int window, T* output) {
+    constexpr T nan = std::numeric_limits<T>::quiet_NaN();
 
-    if (size < (size_t)window) return result;
+    if (window <= 0 || size < (size_t)window) {
+        std::fill(output, output + size, nan);
+        return;
+    }
+    std::fill(output, output + window - 1, nan);
 
     // Initial window sum
-    double current_sum = std::accumulate(input.begin(), input.begin() + window, 0.0);
-    result[window - 1] = current_sum / window;
+    double current_sum = std::accumulate(input, input + window, 0.0);
+    output[window - 1] = static_cast<T>(current_sum / window);
 
     // Sliding window logic O(n)
     for (size_t i = window; i < size; ++i) {
-        current_sum += input[i] - input[i - window];
-        result[i] = current_sum / window;
+        current_sum += static_cast<double>(input[i]) - input[i - window];
+        output[i] = static_cast<T>(current_sum / window);
     }
-
-    return result;
 }
 
 /// @brief Calculates the Exponential Moving Average (EMA) of the input data over a specified window.
 std::vector<double> compute_ema(const std::vector<double>& input, const int& window) {
-    const size_t size = input.size();
-    std::vector<double> result(size);
+    std::vector<double> result(input.size());
+    compute_ema(input.data(), input.size(), window, result.data());
+    return result;
+}
 
-    if (size == 0) return result;
+/// @brief Raw-buffer EMA kernel: writes directly into a caller-owned output buffer.
+template <typename In, typename T>
+void compute_ema(const In* input, size_t size, int window, T* output) {
+    if (size == 0) return;
 
     const double alpha = 2.0 / (window + 1.0);
     const double beta = 1.0 - alpha;
-    
-    result[0] = input[0];
+
+    // Keep the running value in a register instead of re-reading output[i - 1]
+    double ema = input[0];
+    output[0] = static_cast<T>(ema);
 
     for (size_t i = 1; i < size; ++i) {
-        result[i] = (input[i] * alpha) + (result[i - 1] * beta);
+        ema = (input[i] * alpha) + (ema * beta);
+        output[i] = static_cast<T>(ema);
     }
-
-    return result;
 }
 
 /// @brief Calculates the Relative Strength Index (RSI) of the input data over a specified window.
 std::vector<double> compute_rsi(const std::vector<double>& input, const int& window) {
-    size_t size = input.size();
-    std::vector<double> rsi(size, std::numeric_limits<double>::quiet_NaN());
+    std::vector<double> rsi(input.size());
+    compute_rsi(input.data(), input.size(), window, rsi.data());
+    return rsi;
+}
+
+namespace {
 
-    if (size <= (size_t)window) return rsi;
+/// @brief RSI kernel body. `Window` is `int`, or a std::integral_constant when the window is
+/// known at compile time (constant loop bounds and divisors).
+template <typename In, typename T, typename Window>
+void rsi_kernel(const In* input, size_t size, Window window, T* output) {
+    constexpr T nan = std::numeric_limits<T>::quiet_NaN();
+
+    if (window <= 0 || size <= (size_t)window) {
+        std::fill(output, output + size, nan);
+        return;
+    }
+    std::fill(output, output + window, nan);
 
     double avg_gain = 0.0, avg_loss = 0.0;
-    double alpha = 1.0 / window;
+    const double carry = window - 1.0;
 
     for (size_t i = 1; i <= (size_t)window; ++i) {
-        double diff = input[i] - input[i - 1];
+        double diff = static_cast<double>(input[i]) - input[i - 1];
         if (diff >= 0) avg_gain += diff;
         else avg_loss -= diff;
     }
     avg_gain /= window; avg_loss /= window;
 
     auto calc = [](double g, double l) { 
-        return (l == 0) ? 100.0 : 100.0 - (100.0 / (1.0 + g / l)); 
+        return static_cast<T>((l == 0) ? 100.0 : 100.0 - (100.0 / (1.0 + g / l)));
     };
 
-    rsi[window] = calc(avg_gain, avg_loss);
+    output[window] = calc(avg_gain, avg_loss);
 
+    // Wilder's smoothing: O(1) per output, avg = (avg * (w - 1) + x) / w
     for (size_t i = window + 1; i < size; ++i) {
-        double diff = input[i] - input[i - 1];
+        double diff = static_cast<double>(input[i]) - input[i - 1];
         double gain = std::max(0.0, diff);
         double loss = std::max(0.0, -diff);
-        avg_gain = (gain * alpha) + (avg_gain * (1.0 - alpha));
-        avg_loss = (loss * alpha) + (avg_loss * (1.0 - alpha));
-        rsi[i] = calc(avg_gain, avg_loss);
+        avg_gain = (avg_gain * carry + gain) / window;
+        avg_loss = (avg_loss * carry + loss) / window;
+        output[i] = calc(avg_gain, avg_loss);
+    }
+}
+
+} // namespace
+
+/// @brief Raw-buffer RSI kernel: writes directly into a caller-owned output buffer.
+template <typename In, typename T>
+void compute_rsi(const In* input, size_t size, int window, T* output) {
+    // The standard window runs a copy compiled with it as a constant
+    if (window == standard_rsi_window) {
+        rsi_kernel(input, size, std::integral_constant<int, standard_rsi_window>{}, output);
+    } else {
+        rsi_kernel(input, size, window, output);
     }
-    return rsi;
 }
 
 
 /// @brief Calculates the Bollinger Bands of the input data over a specified window.
 std::tuple<std::vector<double>, std::vector<double>, std::vector<double>> 
 compute_bollinger_bands(const std::vector<double>& input, const int& window, const double& k) {
-    const ssize_t size = input.size();
+    const size_t size = input.size();
+    std::vector<double> upper_arr(size);
+    std::vector<double> mid_arr(size);
+    std::vector<double> lower_arr(size);
+    compute_bollinger_bands(input.data(), size, window, k,
+                            upper_arr.data(), mid_arr.data(), lower_arr.data());
+    return std::make_tuple(upper_arr, mid_arr, lower_arr);
+}
 
-    constexpr double nan = std::numeric_limits<double>::quiet_NaN();
-    auto upper_arr = std::vector<double>(size, nan);
-    auto mid_arr = std::vector<double>(size, nan);
-    auto lower_arr = std::vector<double>(size, nan);
+namespace {
+
+/// @brief Bollinger Bands kernel body (`Window` as in rsi_kernel).
+template <typename In, typename T, typename Window>
+void bollinger_kernel(const In* input, size_t size, Window window, double k,
+                      T* upper_out, T* mid_out, T* lower_out) {
+    constexpr T nan = std::numeric_limits<T>::quiet_NaN();
 
-    if (size < window) {
-        return std::make_tuple(upper_arr, mid_arr, lower_arr);
+    if (window <= 0 || size < (size_t)window) {
+        std::fill(upper_out, upper_out + size, nan);
+        std::fill(mid_out, mid_out + size, nan);
+        std::fill(lower_out, lower_out + size, nan);
+        return;
     }
+    std::fill(upper_out, upper_out + window - 1, nan);
+    std::fill(mid_out, mid_out + window - 1, nan);
+    std::fill(lower_out, lower_out + window - 1, nan);
 
     double sum = 0.0;
     double sum_sq = 0.0;
 
-    // Initial window
-    for (ssize_t i = 0; i < window; ++i) {
-        sum += input[i];
-        sum_sq += input[i] * input[i];
-    }
+    // Initial window (vectorised), then O(1) slides
+    window_sums(input, (size_t)window, sum, sum_sq);
 
-    auto compute_bands = [&](ssize_t idx, double current_sum, double current_sum_sq) {
-        double mean = current_sum / window;
+    auto compute_bands = [&](size_t idx) {
+        double mean = sum / window;
         // Variance formula: (sum_sq - (sum^2 / N)) / N
-        double variance = (current_sum_sq - (current_sum * current_sum / window)) / window;
+        double variance = (sum_sq - (sum * sum / window)) / window;
         double std_dev = std::sqrt(std::max(0.0, variance)); // std::max handles precision noise
 
-        mid_arr[idx] = mean;
-        upper_arr[idx] = mean + (k * std_dev);
-        lower_arr[idx] = mean - (k * std_dev);
+        mid_out[idx] = static_cast<T>(mean);
+        upper_out[idx] = static_cast<T>(mean + (k * std_dev));
+        lower_out[idx] = static_cast<T>(mean - (k * std_dev));
     };
 
-    compute_bands(window - 1, sum, sum_sq);
+    compute_bands(window - 1);
 
-    // Sliding window logic
-    for (ssize_t i = window; i < size; ++i) {
-        sum += input[i] - input[i - window];
-        sum_sq += (input[i] * input[i]) - (input[i - window] * input[i - window]);
-        compute_bands(i, sum, sum_sq);
+    // Sliding window logic: O(1) per output (add incoming, subtract outgoing)
+    for (size_t i = window; i < size; ++i) {
+        const double x_in = input[i];
+        const double x_out = input[i - window];
+        sum += x_in - x_out;
+        sum_sq += (x_in * x_in) - (x_out * x_out);
+        compute_bands(i);
     }
+}
 
-    return std::make_tuple(upper_arr, mid_arr, lower_arr);
+} // namespace
+
+/// @brief Raw-buffer Bollinger Bands kernel: running sum and sum of squares, one pass.
+template <typename In, typename T>
+void compute_bollinger_bands(const In* input, size_t size, int window, double k,
+                             T* upper_out, T* mid_out, T* lower_out) {
+    if (window == standard_bb_window) {
+        bollinger_kernel(input, size, std::integral_constant<int, standard_bb_window>{}, k,
+                         upper_out, mid_out, lower_out);
+    } else {
+        bollinger_kernel(input, size, window, k, upper_out, mid_out, lower_out);
+    }
 }
 
 /// @brief Calculates the Moving Average Convergence Divergence (MACD) of the input data.
@@ -127,52 +248,214 @@ compute_macd(const std::vector<double>& input,
              const int& fast_period, 
              const int& slow_period, 
              const int& signal_period) {
-    
-    const size_t size = input.size();
-    constexpr double nan = std::numeric_limits<double>::quiet_NaN();
-    
-    std::vector<double> macd_line(size, nan);
-    std::vector<double> signal_line(size, nan);
+    std::vector<double> macd_line(input.size());
+    std::vector<double> signal_line(input.size());
+    compute_macd(input.data(), input.size(), fast_period, slow_period, signal_period,
+                 macd_line.data(), signal_line.data());
+    return {macd_line, signal_line};
+}
 
-    if (size == 0) return {macd_line, signal_line};
+/// @brief Raw-buffer MACD kernel: fast EMA, slow EMA and signal EMA advance together in one pass.
+template <typename In, typename T>
+void compute_macd(const In* input, size_t size, int fast_period, int slow_period,
+                  int signal_period, T* macd_out, T* signal_out) {
+    if (size == 0) return;
 
     // EMA Constants
     const double alpha_fast = 2.0 / (fast_period + 1.0);
     const double alpha_slow = 2.0 / (slow_period + 1.0);
     const double alpha_sig  = 2.0 / (signal_period + 1.0);
 
-    double current_ema_fast = input[0];
-    double current_ema_slow = input[0];
-    
-    macd_line[0] = current_ema_fast - current_ema_slow;
+    double ema_fast = input[0];
+    double ema_slow = input[0];
+    double ema_sig = ema_fast - ema_slow;
 
-    // Step 1: Calculate MACD Line (Difference of two EMAs)
+    macd_out[0] = static_cast<T>(ema_sig);
+    signal_out[0] = static_cast<T>(ema_sig);
+
+    // Single pass: the signal line is an EMA of the MACD value just computed,
+    // so all three recurrences can share the same read of input[i].
     for (size_t i = 1; i < size; ++i) {
-        current_ema_fast = (input[i] * alpha_fast) + (current_ema_fast * (1.0 - alpha_fast));
-        current_ema_slow = (input[i] * alpha_slow) + (current_ema_slow * (1.0 - alpha_slow));
-        macd_line[i] = current_ema_fast - current_ema_slow;
+        ema_fast = (input[i] * alpha_fast) + (ema_fast * (1.0 - alpha_fast));
+        ema_slow = (input[i] * alpha_slow) + (ema_slow * (1.0 - alpha_slow));
+        const double macd = ema_fast - ema_slow;
+        ema_sig = (macd * alpha_sig) + (ema_sig * (1.0 - alpha_sig));
+
+        macd_out[i] = static_cast<T>(macd);
+        signal_out[i] = static_cast<T>(ema_sig);
     }
+}
 
-    // Step 2: Calculate Signal Line (EMA of the MACD Line)
-    signal_line[0] = macd_line[0];
-    for (size_t i = 1; i < size; ++i) {
-        // We only compute signal if macd_line at that point is not NaN
-        if (!std::isnan(macd_line[i])) {
-            signal_line[i] = (macd_line[i] * alpha_sig) + (signal_line[i - 1] * (1.0 - alpha_sig));
+namespace {
+
+/// @brief Fused kernel body (`RsiWindow` and `BbWindow` as in rsi_kernel).
+template <typename In, typename T, typename RsiWindow, typename BbWindow>
+void all_kernel(const In* input, size_t size, RsiWindow rsi_window, BbWindow bb_window, double bb_k,
+                int macd_fast, int macd_slow, int macd_signal,
+                T* rsi_out, T* macd_out, T* signal_out, T* upper_out, T* mid_out, T* lower_out) {
+    if (size == 0) return;
+
+    constexpr T nan = std::numeric_limits<T>::quiet_NaN();
+    // Same degenerate-input rules as the standalone kernels: all NaN
+    const bool rsi_on = rsi_window > 0 && size > (size_t)rsi_window;
+    const bool bb_on = bb_window > 0 && size >= (size_t)bb_window;
+
+    // RSI state (Wilder's smoothing)
+    double avg_gain = 0.0, avg_loss = 0.0;
+    const double rsi_carry = rsi_window - 1.0;
+
+    // MACD state
+    const double alpha_fast = 2.0 / (macd_fast + 1.0);
+    const double alpha_slow = 2.0 / (macd_slow + 1.0);
+    const double alpha_sig  = 2.0 / (macd_signal + 1.0);
+    double ema_fast = input[0];
+    double ema_slow = input[0];
+    double ema_sig = ema_fast - ema_slow;
+
+    // Bollinger state (running sum and sum of squares)
+    double sum = 0.0, sum_sq = 0.0;
+
+    for (size_t i = 0; i < size; ++i) {
+        const double x = input[i];
+
+        // MACD
+        if (i > 0) {
+            ema_fast = (x * alpha_fast) + (ema_fast * (1.0 - alpha_fast));
+            ema_slow = (x * alpha_slow) + (ema_slow * (1.0 - alpha_slow));
+            const double macd = ema_fast - ema_slow;
+            ema_sig = (macd * alpha_sig) + (ema_sig * (1.0 - alpha_sig));
+            macd_out[i] = static_cast<T>(macd);
+        } else {
+            macd_out[i] = static_cast<T>(ema_sig);
+        }
+        signal_out[i] = static_cast<T>(ema_sig);
+
+        // RSI: seed with the mean of the first `window` changes, then smooth
+        rsi_out[i] = nan;
+        if (rsi_on && i > 0) {
+            const double diff = x - input[i - 1];
+            if (i <= (size_t)rsi_window) {
+                if (diff >= 0) avg_gain += diff;
+                else avg_loss -= diff;
+                if (i == (size_t)rsi_window) {
+                    avg_gain /= rsi_window;
+                    avg_loss /= rsi_window;
+                }
+            } else {
+                avg_gain = (avg_gain * rsi_carry + std::max(0.0, diff)) / rsi_window;
+                avg_loss = (avg_loss * rsi_carry + std::max(0.0, -diff)) / rsi_window;
+            }
+            if (i >= (size_t)rsi_window) {
+                rsi_out[i] = static_cast<T>((avg_loss == 0) ? 100.0
+                                                            : 100.0 - (100.0 / (1.0 + avg_gain / avg_loss)));
+            }
+        }
+
+        // Bollinger Bands: NaN until the window fills, then O(1) slide
+        upper_out[i] = mid_out[i] = lower_out[i] = nan;
+        if (bb_on) {
+            if (i + 1 == (size_t)bb_window) {
+                window_sums(input, (size_t)bb_window, sum, sum_sq);
+            } else if (i >= (size_t)bb_window) {
+                const double x_out = input[i - bb_window];
+                sum += x - x_out;
+                sum_sq += (x * x) - (x_out * x_out);
+            }
+            if (i + 1 >= (size_t)bb_window) {
+                const double mean = sum / bb_window;
+                const double variance = (sum_sq - (sum * sum / bb_window)) / bb_window;
+                const double std_dev = std::sqrt(std::max(0.0, variance));
+                mid_out[i] = static_cast<T>(mean);
+                upper_out[i] = static_cast<T>(mean + (bb_k * std_dev));
+                lower_out[i] = static_cast<T>(mean - (bb_k * std_dev));
+            }
         }
     }
+}
 
-    return {macd_line, signal_line};
+} // namespace
+
+/// @brief Fused indicator kernel: RSI, MACD and Bollinger Bands in a single pass over the input.
+template <typename In, typename T>
+void compute_all(const In* input, size_t size, int rsi_window, int bb_window, double bb_k,
+                 int macd_fast, int macd_slow, int macd_signal,
+                 T* rsi_out, T* macd_out, T* signal_out, T* upper_out, T* mid_out, T* lower_out) {
+    if (rsi_window == standard_rsi_window && bb_window == standard_bb_window) {
+        all_kernel(input, size, std::integral_constant<int, standard_rsi_window>{},
+                   std::integral_constant<int, standard_bb_window>{}, bb_k, macd_fast, macd_slow,
+                   macd_signal, rsi_out, macd_out, signal_out, upper_out, mid_out, lower_out);
+    } else {
+        all_kernel(input, size, rsi_window, bb_window, bb_k, macd_fast, macd_slow, macd_signal,
+                   rsi_out, macd_out, signal_out, upper_out, mid_out, lower_out);
+    }
+}
+
+// Explicit instantiations: float64 in/out, float64 in with float32 out for the bandwidth-bound
+// callers, and float32 in/out for series that are already stored as float32
+#define INSTANTIATE_INDICATOR_KERNELS(In, T)                                                        \
+    template void compute_sma<In, T>(const In*, size_t, int, T*);                                   \
+    template void compute_ema<In, T>(const In*, size_t, int, T*);                                   \
+    template void compute_rsi<In, T>(const In*, size_t, int, T*);                                   \
+    template void compute_bollinger_bands<In, T>(const In*, size_t, int, double, T*, T*, T*);       \
+    template void compute_macd<In, T>(const In*, size_t, int, int, int, T*, T*);                    \
+    template void compute_all<In, T>(const In*, size_t, int, int, double, int, int, int,            \
+                                     T*, T*, T*, T*, T*, T*);
+
+INSTANTIATE_INDICATOR_KERNELS(double, double)
+INSTANTIATE_INDICATOR_KERNELS(double, float)
+INSTANTIATE_INDICATOR_KERNELS(float, float)
+#undef INSTANTIATE_INDICATOR_KERNELS
+
+
+/// @brief Fused backtest kernel: market/strategy returns, equity curves and drawdown in one pass.
+void compute_backtest_returns(const double* close, const double* signal, size_t size,
+                              double* market_returns, double* strategy_returns,
+                              double* cum_market, double* cum_strategy, double* drawdown) {
+    if (size == 0) return;
+
+    constexpr double nan = std::numeric_limits<double>::quiet_NaN();
+    market_returns[0] = nan;
+    strategy_returns[0] = nan;
+    cum_market[0] = nan;
+    cum_strategy[0] = nan;
+    drawdown[0] = nan;
+
+    double equity_market = 1.0;
+    double equity_strategy = 1.0;
+    double peak = -std::numeric_limits<double>::infinity();
+
+    for (size_t i = 1; i < size; ++i) {
+        // We can only profit from a move AFTER we take the position
+        const double r = close[i] / close[i - 1] - 1.0;
+        const double sr = r * signal[i - 1];
+
+        equity_market *= 1.0 + r;
+        equity_strategy *= 1.0 + sr;
+        peak = std::max(peak, equity_strategy);
+
+        market_returns[i] = r;
+        strategy_returns[i] = sr;
+        cum_market[i] = equity_market;
+        cum_strategy[i] = equity_strategy;
+        drawdown[i] = equity_strategy / peak - 1.0;
+    }
 }
 
 // Logic and Strategy
 /// @brief Checks trading signals based on RSI and Bollinger Bands.
 int compute_signals(const std::vector<double>& rsi, const std::vector<double>& price,
                     const std::vector<double>& bb_upper, const std::vector<double>& bb_lower) {
-    if (rsi.empty() || std::isnan(rsi.back())) return 0;
-    
+    if (rsi.empty()) return 0;
+
     size_t last = rsi.size() - 1;
-    if (rsi[last] < 30.0 && price[last] < bb_lower[last]) return 1;  // BUY
-    if (rsi[last] > 70.0 && price[last] > bb_upper[last]) return -1; // SELL
+    return compute_signals(rsi[last], price[last], bb_upper[last], bb_lower[last]);
+}
+
+/// @brief Checks the trading signal for a single bar (scalar version of compute_signals).
+int compute_signals(double rsi, double price, double bb_upper, double bb_lower) {
+    if (std::isnan(rsi)) return 0;
+
+    if (rsi < 30.0 && price < bb_lower) return 1;  // BUY
+    if (rsi > 70.0 && price > bb_upper) return -1; // SELL
     return 0;
 }
\ No newline at end of file
@@ -1,17 +1,66 @@
 #include "core/market_manager.h"
 #include "utils/logger.h"
+#include <algorithm>
+#include <atomic>
 #include <iostream>
 #include <cstdio>
+#include <chrono>
+#include <limits>
+#include <stdexcept>
+#include <thread>
 
 // --- AssetData Implementation ---
 
-void AssetData::add_price(double price, size_t max_size)
+void AssetData::add_price(double price, int64_t timestamp)
 {
-    prices.push_back(price);
-    if (prices.size() > max_size)
+    prices[head] = price;
+    timestamps[head] = timestamp;
+    head = (head + 1) % max_history;
+    count = std::min(count + 1, max_history);
+}
+
+double AssetData::last_price() const
+{
+    return prices[(head + max_history - 1) % max_history];
+}
+
+int64_t AssetData::last_timestamp() const
+{
+    return count == 0 ? no_timestamp : timestamps[(head + max_history - 1) % max_history];
+}
+
+int AssetData::update_candle(int64_t timestamp, double close)
+{
+    const int64_t current = last_timestamp();
+
+    // Late update for an older candle
+    if (current != no_timestamp && timestamp < current)
     {
-        prices.erase(prices.begin());
+        return 0;
     }
+
+    // Same candle still forming: overwrite it and only re-evaluate the indicator tip
+    if (timestamp == current)
+    {
+        prices[(head + max_history - 1) % max_history] = close;
+        return update_signal(close, false);
+    }
+
+    // A new candle opened: the previous one is committed to the indicators
+    add_price(close, timestamp);
+    return update_signal(close, true);
+}
+
+int AssetData::update_signal(double price, bool append)
+{
+    const double rsi_value = rsi.update_last(price, append);
+    const auto [upper, mid, lower] = bands.update_last(price, append);
+
+    // We need at least enough candles for the slowest indicator (MACD 26);
+    // the bands are NaN until their window is full
+    const int signal = (std::isnan(mid) || count < 26) ? 0 : compute_signals(rsi_value, price, upper, lower);
+    latest = IndicatorSnapshot{price, rsi_value, upper, mid, lower, signal, count};
+    return signal;
 }
 
 // --- MarketManager Implementation ---
@@ -22,52 +71,278 @@ MarketManager::MarketManager(size_t num_threads) : pool(num_threads) {}
 /// @brief Update tick data for a given symbol.
 void MarketManager::update_tick(const std::string &symbol, double price)
 {
-    // Dispatch: Python entrega el dato y se libera inmediatamente
-    pool.enqueue([this, symbol, price]()
-                 { this->process_symbol(symbol, price); });
+    push(slot_for(symbol), TickMsg{AssetData::no_timestamp, price}, true);
+}
+
+/// @brief Non-blocking update_tick.
+bool MarketManager::try_update_tick(const std::string &symbol, double price)
+{
+    return push(slot_for(symbol), TickMsg{AssetData::no_timestamp, price}, false);
+}
+
+/// @brief Update the candle currently being formed for a given symbol.
+void MarketManager::update_candle(const std::string &symbol, int64_t timestamp, double close)
+{
+    push(slot_for(symbol), TickMsg{timestamp, close}, true);
+}
+
+/// @brief Non-blocking update_candle.
+bool MarketManager::try_update_candle(const std::string &symbol, int64_t timestamp, double close)
+{
+    return push(slot_for(symbol), TickMsg{timestamp, close}, false);
+}
+
+/// @brief Interns a symbol: returns its integer id, creating its state on first use.
+uint16_t MarketManager::register_symbol(const std::string &symbol)
+{
+    return slot_for(symbol).id;
+}
+
+/// @brief update_tick for a symbol id returned by register_symbol.
+void MarketManager::update_tick_id(uint16_t id, double price)
+{
+    push(slot_at(id), TickMsg{AssetData::no_timestamp, price}, true);
+}
+
+/// @brief Non-blocking update_tick_id.
+bool MarketManager::try_update_tick_id(uint16_t id, double price)
+{
+    return push(slot_at(id), TickMsg{AssetData::no_timestamp, price}, false);
+}
+
+/// @brief update_candle for a symbol id returned by register_symbol.
+void MarketManager::update_candle_id(uint16_t id, int64_t timestamp, double close)
+{
+    push(slot_at(id), TickMsg{timestamp, close}, true);
+}
+
+/// @brief Non-blocking update_candle_id.
+bool MarketManager::try_update_candle_id(uint16_t id, int64_t timestamp, double close)
+{
+    return push(slot_at(id), TickMsg{timestamp, close}, false);
+}
+
+/// @brief Queues a batch of candle updates that may span several symbols.
+void MarketManager::update_candles_id(const CandleUpdate *updates, size_t count)
+{
+    for (size_t i = 0; i < count; ++i)
+    {
+        push(slot_at(updates[i].id), TickMsg{updates[i].timestamp, updates[i].close}, true);
+    }
+}
+
+/// @brief Queues a batch of ticks for a symbol, in order.
+void MarketManager::update_ticks(const std::string &symbol, const double *prices, size_t count)
+{
+    SymbolSlot &slot = slot_for(symbol);
+    std::lock_guard<std::mutex> producer(slot.producer_mutex);
+    for (size_t i = 0; i < count; ++i)
+    {
+        push_locked(slot, TickMsg{AssetData::no_timestamp, prices[i]}, true);
+    }
 }
 
 /// @brief Check last price, for debugging.
 double MarketManager::get_last_price(const std::string &symbol)
 {
     std::shared_lock<std::shared_mutex> lock(data_mutex);
-    if (market_data.find(symbol) != market_data.end())
+    auto it = market_data.find(symbol);
+    if (it != market_data.end())
     {
-        return market_data.at(symbol).prices.back();
+        return it->second->last_price.load(std::memory_order_acquire);
     }
     return 0.0;
 }
 
-/// @brief Execution in threads
-void MarketManager::process_symbol(std::string symbol, double price)
+/// @brief Indicator values at the latest update processed for a symbol, for debugging.
+IndicatorSnapshot MarketManager::get_indicators(const std::string &symbol)
+{
+    SymbolSlot *slot = nullptr;
+    {
+        std::shared_lock<std::shared_mutex> lock(data_mutex);
+        auto it = market_data.find(symbol);
+        if (it == market_data.end())
+        {
+            return IndicatorSnapshot{};
+        }
+        slot = it->second.get();
+    }
+    std::lock_guard<std::mutex> lock(slot->snapshot_mutex);
+    return slot->snapshot;
+}
+
+/// @brief Blocks until every update queued so far has been processed.
+bool MarketManager::wait_until_idle(double timeout_seconds)
+{
+    std::unique_lock<std::mutex> lock(idle_mutex);
+    return idle_cv.wait_for(lock, std::chrono::duration<double>(timeout_seconds), [this]
+                            { return in_flight.load(std::memory_order_acquire) == 0; });
+}
+
+/// @brief Marks updates as processed, waking wait_until_idle once none are left.
+void MarketManager::finish(size_t processed)
+{
+    if (in_flight.fetch_sub(processed, std::memory_order_acq_rel) == processed)
+    {
+        // Taking the mutex orders this notify after a waiter's predicate check
+        std::lock_guard<std::mutex> lock(idle_mutex);
+        idle_cv.notify_all();
+    }
+}
+
+/// @brief Finds the slot of a symbol, creating it on first use.
+SymbolSlot &MarketManager::slot_for(const std::string &symbol)
+{
+    {
+        std::shared_lock<std::shared_mutex> lock(data_mutex);
+        auto it = market_data.find(symbol);
+        if (it != market_data.end())
+        {
+            return *it->second;
+        }
+    }
+    // Slots are heap-allocated, so references stay valid across rehashes
+    std::unique_lock<std::shared_mutex> lock(data_mutex);
+    auto &slot = market_data[symbol];
+    if (!slot)
+    {
+        if (slots_by_id.size() > std::numeric_limits<uint16_t>::max())
+        {
+            market_data.erase(symbol);
+            throw std::length_error("MarketManager: too many symbols");
+        }
+        slot = std::make_unique<SymbolSlot>(symbol, static_cast<uint16_t>(slots_by_id.size()));
+        slots_by_id.push_back(slot.get());
+    }
+    return *slot;
+}
+
+/// @brief Slot of a registered symbol id.
+SymbolSlot &MarketManager::slot_at(uint16_t id) const
+{
+    std::shared_lock<std::shared_mutex> lock(data_mutex);
+    if (id >= slots_by_id.size())
+    {
+        throw std::out_of_range("MarketManager: unknown symbol id");
+    }
+    return *slots_by_id[id];
+}
+
+/// @brief Queues an update and schedules a drain if none is pending.
+bool MarketManager::push(SymbolSlot &slot, const TickMsg &msg, bool wait)
 {
-    std::vector<double> prices_snapshot;
+    std::lock_guard<std::mutex> producer(slot.producer_mutex);
+    return push_locked(slot, msg, wait);
+}
+
+/// @brief push() body; the caller holds `slot.producer_mutex`.
+bool MarketManager::push_locked(SymbolSlot &slot, const TickMsg &msg, bool wait)
+{
+    const bool is_candle = msg.timestamp != AssetData::no_timestamp;
+    if (is_candle && slot.last_candle != AssetData::no_timestamp && msg.timestamp < slot.last_candle)
+    {
+        return true; // Late update for an older candle: nothing to do
+    }
+
+    // Counted before the push so the drain can never decrement it first
+    in_flight.fetch_add(1, std::memory_order_relaxed);
+    while (!slot.ring.try_push(msg))
+    {
+        if (!wait)
+        {
+            finish(1);
+            return false;
+        }
+        // Full: the scheduled drain frees room; back off meanwhile
+        std::this_thread::yield();
+    }
+
+    if (is_candle)
+    {
+        slot.last_candle = msg.timestamp;
+    }
+    slot.last_price.store(msg.price, std::memory_order_release);
+
+    // Pairs with the fence in drain(): the push (a store) must be visible before `scheduled`
+    // is read, or both sides could miss each other (store-buffer reordering) and the update
+    // would sit in the ring with no drain scheduled
+    std::atomic_thread_fence(std::memory_order_seq_cst);
 
-    // 1. Critical Section: Update shared state
+    // Only the first update after a drain has finished needs to wake a worker
+    if (!slot.scheduled.exchange(true, std::memory_order_acq_rel))
     {
-        std::unique_lock<std::shared_mutex> lock(data_mutex);
-        AssetData &data = market_data[symbol];
-        data.add_price(price);
-        // Copy to local vector to process WITHOUT lock
-        prices_snapshot = data.prices;
+        pool.enqueue([this, &slot]()
+                     { this->drain(slot); });
     }
+    return true;
+}
+
+/// @brief Execution in threads: processes every queued update of a symbol, in order.
+void MarketManager::drain(SymbolSlot &slot)
+{
+    AssetData &data = slot.data;
+    TickMsg msg;
 
-    // 2. Heavy Lifting: Parallel execution (No GIL, No Locks)
-    // We need at least enough candles for the slowest indicator (MACD 26)
-    if (prices_snapshot.size() >= 26)
+    while (true)
     {
-        auto rsi_v = compute_rsi(prices_snapshot, 14);
-        auto [up, mid, lo] = compute_bollinger_bands(prices_snapshot, 20, 2.0);
+        size_t processed = 0;
+
+        // Batch: everything queued so far, no locks. The indicators are advanced
+        // incrementally (O(1) per tick), so there is no snapshot to copy and
+        // recompute over the whole price history.
+        while (slot.ring.try_pop(msg))
+        {
+            int signal = 0;
+            if (msg.timestamp == AssetData::no_timestamp)
+            {
+                data.add_price(msg.price);
+                signal = data.update_signal(msg.price);
+            }
+            else
+            {
+                signal = data.update_candle(msg.timestamp, msg.price);
+            }
+            // Only transitions are reported: a signal that holds is not re-logged every tick
+            if (signal != slot.last_signal)
+            {
+                slot.last_signal = signal;
+                log_signal(slot.symbol, msg.price, signal);
+            }
+            ++processed;
+        }
+
+        if (processed > 0)
+        {
+            {
+                std::lock_guard<std::mutex> lock(slot.snapshot_mutex);
+                slot.snapshot = data.latest;
+            }
+            finish(processed);
+        }
 
-        int signal = compute_signals(rsi_v, prices_snapshot, up, lo);
+        slot.scheduled.store(false, std::memory_order_release);
+        // Pairs with the fence in push_locked(): the cleared flag must be visible before the
+        // ring is checked (release/acquire alone allows the store to pass the load)
+        std::atomic_thread_fence(std::memory_order_seq_cst);
 
-        if (signal != 0)
+        // A producer may have pushed after the last pop but before the flag was
+        // cleared (and so did not schedule a drain): take it over if nobody else did
+        if (slot.ring.empty() || slot.scheduled.exchange(true, std::memory_order_acq_rel))
         {
-            std::string action = (signal == 1) ? "BUY" : "SELL";
-            std::string msg = "Symbol: " + symbol +
-                              " | Price: " + std::to_string(prices_snapshot.back()) +
-                              " | Action: " + action;
-            Logger::log(LogLevel::SIGNAL, msg);
+            return;
         }
     }
 }
+
+/// @brief Logs a BUY/SELL signal (no-op for 0).
+void MarketManager::log_signal(const std::string &symbol, double price, int signal)
+{
+    if (signal != 0)
+    {
+        std::string action = (signal == 1) ? "BUY" : "SELL";
+        std::string msg = "Symbol: " + symbol +
+                          " | Price: " + std::to_string(price) +
+                          " | Action: " + action;
+        Logger::log(LogLevel::SIGNAL, msg);
+    }
+}
@@ -1,89 +1,201 @@
 #include "core/trading_core.h"
 #include "core/market_manager.h"
 
+#include <stdexcept>
+
 /// @brief Calculates the Simple Moving Average (SMA) of the input data over a specified window.
-py::array_t<double> calculate_sma_cpp(const py::array_t<double> &input_data, const int &window)
+template <typename T, typename Array>
+py::array_t<T> calculate_sma_cpp(const Array &input_data, const int &window)
 {
-    // 1. Convert input data to std::vector
-    auto buf = input_data.request();
-    std::vector<double> input_vec(static_cast<double *>(buf.ptr),
-                                  static_cast<double *>(buf.ptr) + buf.size);
+    // 1. Read input buffer in place and preallocate the output array
+    const auto size = static_cast<size_t>(input_data.size());
+    const auto *in = input_data.data();
+    py::array_t<T> result(input_data.size());
+    T *out = result.mutable_data();
 
-    // 2. Call function
-    std::vector<double> res_vec = compute_sma(input_vec, window);
+    // 2. Call kernel without holding the GIL (writes directly into the numpy buffer)
+    {
+        py::gil_scoped_release release;
+        compute_sma(in, size, window, out);
+    }
 
-    // 3. Convert result to py::array_t
-    return py::cast(res_vec);
+    return result;
 }
 
 /// @brief Calculates the Exponential Moving Average (EMA) of the input data over a specified window.
-py::array_t<double> calculate_ema_cpp(const py::array_t<double> &input_data, const int &window)
+template <typename T, typename Array>
+py::array_t<T> calculate_ema_cpp(const Array &input_data, const int &window)
 {
-    // 1. Convert input data to std::vector
-    auto buf = input_data.request();
-    std::vector<double> input_vec(static_cast<double *>(buf.ptr),
-                                  static_cast<double *>(buf.ptr) + buf.size);
+    // 1. Read input buffer in place and preallocate the output array
+    const auto size = static_cast<size_t>(input_data.size());
+    const auto *in = input_data.data();
+    py::array_t<T> result(input_data.size());
+    T *out = result.mutable_data();
 
-    // 2. Call function
-    std::vector<double> res_vec = compute_ema(input_vec, window);
+    // 2. Call kernel without holding the GIL (raw pointers only)
+    {
+        py::gil_scoped_release release;
+        compute_ema(in, size, window, out);
+    }
 
-    // 3. Convert result to py::array_t
-    return py::cast(res_vec);
+    return result;
 }
 
 /// @brief Calculates the Relative Strength Index (RSI) of the input data over a specified window.
-py::array_t<double> calculate_rsi_cpp(const py::array_t<double> &input_data, const int &window)
+template <typename T, typename Array>
+py::array_t<T> calculate_rsi_cpp(const Array &input_data, const int &window)
 {
-    // 1. Convert input_data to std::vector
-    auto buf = input_data.request();
-    std::vector<double> input_vec(static_cast<double *>(buf.ptr),
-                                  static_cast<double *>(buf.ptr) + buf.size);
+    // 1. Read input buffer in place and preallocate the output array
+    const auto size = static_cast<size_t>(input_data.size());
+    const auto *in = input_data.data();
+    py::array_t<T> result(input_data.size());
+    T *out = result.mutable_data();
 
-    // 2. Call function
-    std::vector<double> result_vec = compute_rsi(input_vec, window);
+    // 2. Call kernel without holding the GIL
+    {
+        py::gil_scoped_release release;
+        compute_rsi(in, size, window, out);
+    }
 
-    // 3. Convert result to py::array_t
-    return py::cast(result_vec);
+    return result;
 }
 
 /// @brief Calculates the Bollinger Bands of the input data over a specified window.
-std::tuple<py::array_t<double>, py::array_t<double>, py::array_t<double>>
-calculate_bollinger_bands_cpp(const py::array_t<double> &input_data, const int &window, const double &k)
+template <typename T, typename Array>
+std::tuple<py::array_t<T>, py::array_t<T>, py::array_t<T>>
+calculate_bollinger_bands_cpp(const Array &input_data, const int &window, const double &k)
 {
-    // 1. Convert input data to std::vector
-    auto buf_in = input_data.request();
-    std::vector<double> input_vec(static_cast<double *>(buf_in.ptr),
-                                  static_cast<double *>(buf_in.ptr) + buf_in.size);
-
-    // 2. Call function
-    auto [upper_v, mid_v, lower_v] = compute_bollinger_bands(input_vec, window, k);
-
-    // 3. Convert to tuple of py::array_t
-    return std::make_tuple(
-        py::cast(upper_v),
-        py::cast(mid_v),
-        py::cast(lower_v));
+    // 1. Read input buffer in place and preallocate the three bands
+    const auto size = static_cast<size_t>(input_data.size());
+    const auto *in = input_data.data();
+    py::array_t<T> upper(input_data.size());
+    py::array_t<T> mid(input_data.size());
+    py::array_t<T> lower(input_data.size());
+    T *upper_out = upper.mutable_data();
+    T *mid_out = mid.mutable_data();
+    T *lower_out = lower.mutable_data();
+
+    // 2. Call kernel without holding the GIL
+    {
+        py::gil_scoped_release release;
+        compute_bollinger_bands(in, size, window, k, upper_out, mid_out, lower_out);
+    }
+
+    return std::make_tuple(upper, mid, lower);
 }
 
 /// @brief Calculates the Moving Average Convergence Divergence (MACD) of the input data.
-std::tuple<py::array_t<double>, py::array_t<double>>
-calculate_macd_cpp(const py::array_t<double> &input_data,
+template <typename T, typename Array>
+std::tuple<py::array_t<T>, py::array_t<T>>
+calculate_macd_cpp(const Array &input_data,
                    const int &fast,
                    const int &slow,
                    const int &signal)
 {
-    // 1. Convert input data to std::vector
-    auto buf = input_data.request();
-    std::vector<double> input_vec(static_cast<double *>(buf.ptr),
-                                  static_cast<double *>(buf.ptr) + buf.size);
-
-    // 2. Call function
-    auto [macd_vec, signal_vec] = compute_macd(input_vec, fast, slow, signal);
-
-    // 3. Convert to tuple of py::array_t
-    return std::make_tuple(
-        py::cast(macd_vec),
-        py::cast(signal_vec));
+    // 1. Read input buffer in place and preallocate both output arrays
+    const auto size = static_cast<size_t>(input_data.size());
+    const auto *in = input_data.data();
+    py::array_t<T> macd_line(input_data.size());
+    py::array_t<T> signal_line(input_data.size());
+    T *macd_out = macd_line.mutable_data();
+    T *signal_out = signal_line.mutable_data();
+
+    // 2. Call fused kernel without holding the GIL
+    {
+        py::gil_scoped_release release;
+        compute_macd(in, size, fast, slow, signal, macd_out, signal_out);
+    }
+
+    return std::make_tuple(macd_line, signal_line);
+}
+
+/// @brief Calculates RSI, MACD and Bollinger Bands in a single fused pass.
+template <typename T, typename Array>
+std::tuple<py::array_t<T>, py::array_t<T>, py::array_t<T>,
+           py::array_t<T>, py::array_t<T>, py::array_t<T>>
+calculate_all_cpp(const Array &input_data, const int &rsi_window, const int &bb_window,
+                  const double &bb_k, const int &macd_fast, const int &macd_slow,
+                  const int &macd_signal)
+{
+    // 1. Read input buffer in place and preallocate the six outputs
+    const auto size = static_cast<size_t>(input_data.size());
+    const auto *in = input_data.data();
+    py::array_t<T> rsi(input_data.size());
+    py::array_t<T> macd_line(input_data.size());
+    py::array_t<T> signal_line(input_data.size());
+    py::array_t<T> upper(input_data.size());
+    py::array_t<T> mid(input_data.size());
+    py::array_t<T> lower(input_data.size());
+    T *rsi_out = rsi.mutable_data();
+    T *macd_out = macd_line.mutable_data();
+    T *signal_out = signal_line.mutable_data();
+    T *upper_out = upper.mutable_data();
+    T *mid_out = mid.mutable_data();
+    T *lower_out = lower.mutable_data();
+
+    // 2. Call fused kernel without holding the GIL
+    {
+        py::gil_scoped_release release;
+        compute_all(in, size, rsi_window, bb_window, bb_k, macd_fast, macd_slow, macd_signal,
+                    rsi_out, macd_out, signal_out, upper_out, mid_out, lower_out);
+    }
+
+    return std::make_tuple(rsi, macd_line, signal_line, upper, mid, lower);
+}
+
+// Explicit instantiations: float64 (calculate_*) and float32 (calculate_*_f32) bindings, the
+// latter for both float64 and float32 input series
+#define INSTANTIATE_INDICATOR_WRAPPERS(T, Array)                                                   \
+    template py::array_t<T> calculate_sma_cpp<T, Array>(const Array &, const int &);               \
+    template py::array_t<T> calculate_ema_cpp<T, Array>(const Array &, const int &);               \
+    template py::array_t<T> calculate_rsi_cpp<T, Array>(const Array &, const int &);               \
+    template std::tuple<py::array_t<T>, py::array_t<T>, py::array_t<T>>                            \
+    calculate_bollinger_bands_cpp<T, Array>(const Array &, const int &, const double &);           \
+    template std::tuple<py::array_t<T>, py::array_t<T>>                                            \
+    calculate_macd_cpp<T, Array>(const Array &, const int &, const int &, const int &);            \
+    template std::tuple<py::array_t<T>, py::array_t<T>, py::array_t<T>,                           \
+                        py::array_t<T>, py::array_t<T>, py::array_t<T>>                            \
+    calculate_all_cpp<T, Array>(const Array &, const int &, const int &, const double &,           \
+                                const int &, const int &, const int &);
+
+INSTANTIATE_INDICATOR_WRAPPERS(double, DoubleArray)
+INSTANTIATE_INDICATOR_WRAPPERS(float, DoubleArray)
+INSTANTIATE_INDICATOR_WRAPPERS(float, FloatArray)
+#undef INSTANTIATE_INDICATOR_WRAPPERS
+
+/// @brief Computes the backtest equity curves for a close series and a position series.
+std::tuple<py::array_t<double>, py::array_t<double>, py::array_t<double>,
+           py::array_t<double>, py::array_t<double>>
+calculate_backtest_returns_cpp(const DoubleArray &close, const DoubleArray &signal)
+{
+    if (close.size() != signal.size())
+    {
+        throw std::invalid_argument("close and signal must have the same length");
+    }
+
+    // 1. Read inputs in place and preallocate the five outputs
+    const auto size = static_cast<size_t>(close.size());
+    const double *close_in = close.data();
+    const double *signal_in = signal.data();
+    py::array_t<double> market_returns(close.size());
+    py::array_t<double> strategy_returns(close.size());
+    py::array_t<double> cum_market(close.size());
+    py::array_t<double> cum_strategy(close.size());
+    py::array_t<double> drawdown(close.size());
+    double *mr = market_returns.mutable_data();
+    double *sr = strategy_returns.mutable_data();
+    double *cm = cum_market.mutable_data();
+    double *cs = cum_strategy.mutable_data();
+    double *dd = drawdown.mutable_data();
+
+    // 2. Call fused kernel without holding the GIL
+    {
+        py::gil_scoped_release release;
+        compute_backtest_returns(close_in, signal_in, size, mr, sr, cm, cs, dd);
+    }
+
+    return std::make_tuple(market_returns, strategy_returns, cum_market,
+                           cum_strategy, drawdown);
 }
 
 /// @brief Checks trading signals based on RSI and Bollinger Bands.
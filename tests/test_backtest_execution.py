@@ -59,4 +59,71 @@ def test_market_order_generates_fill(simple_engine):
     assert fill.side == ev.Side.BUY
     assert fill.filled_quantity == 1.0
 
-    assert fill.fill_price == 2001.0
\ No newline at end of file
+    assert fill.fill_price == 2001.0
+
+def test_tick_tape_replay_matches_tick_events():
+    """
+    Ticks replayed from a TickTape fill orders exactly like the same
+    ticks pushed as TickEvent objects, and rows read back as TickEvents.
+    """
+    def run(use_tape):
+        queue = bt.EventQueue()
+        exec_engine = bt.ExecutionEngine(queue, lambda info: info.mid_price)
+        engine = bt.BacktestEngine(queue, exec_engine)
+        tape = bt.TickTape()
+
+        for i in range(5):
+            for symbol, base in (("BTC", 100.0), ("ETH", 10.0)):
+                bid, ask = base + i, base + i + 2.0
+                if use_tape:
+                    tape.append_tick(i * 1000, symbol, bid, ask, 5.0, 5.0, bid + 1.0, 1.0)
+                else:
+                    engine.push_event(ev.TickEvent(ev.make_timestamp(i * 1000), symbol, bid, ask, 5.0, 5.0, bid + 1.0, 1.0))
+            order = ev.OrderEvent(i, ev.make_timestamp(i * 1000), "ETH", ev.Side.BUY, 1.0, 0.0,
+                                  ev.OrderStatus.SUBMITTED, "tape")
+            engine.push_event(order)
+
+        if use_tape:
+            engine.set_tick_tape(tape)
+        engine.run()
+        return tape, exec_engine.get_fills()
+
+    tape, tape_fills = run(use_tape=True)
+    _, event_fills = run(use_tape=False)
+
+    assert [(f.order_id, f.timestamp, f.fill_price) for f in tape_fills] == \
+           [(f.order_id, f.timestamp, f.fill_price) for f in event_fills]
+    assert [f.fill_price for f in tape_fills] == [11.0, 12.0, 13.0, 14.0, 15.0]
+
+    assert len(tape) == 10
+    assert tape.symbols() == ["BTC", "ETH"]
+    assert tape[-1].symbol == "ETH"
+    assert tape[-1].timestamp == 4000
+    assert tape[3].bid == 11.0
+
+
+def test_tick_tape_rejects_out_of_order_ticks():
+    """The tape is replayed by index, so it must be chronological."""
+    tape = bt.TickTape()
+    tape.append_tick(2000, "BTC", 1.0, 2.0, 1.0, 1.0, 1.5, 1.0)
+
+    with pytest.raises(ValueError):
+        tape.append_tick(1000, "BTC", 1.0, 2.0, 1.0, 1.0, 1.5, 1.0)
+
+
+@pytest.mark.parametrize("timestamps, symbol_ids", [
+    ([3000, 4000, 3500], [0, 0, 0]),  # Out of order partway through
+    ([3000, 4000, 5000], [0, 0, 7]),  # Unknown symbol id on the last row
+    ([1000, 4000, 5000], [0, 0, 0]),  # Older than the tape's last tick
+    ([3000, 4000], [0, 0, 0]),        # Mismatched column lengths
+])
+def test_tick_tape_extend_is_all_or_nothing(timestamps, symbol_ids):
+    """A bad row anywhere in the batch rejects the whole extend."""
+    tape = bt.TickTape()
+    tape.append_tick(2000, "BTC", 1.0, 2.0, 1.0, 1.0, 1.5, 1.0)
+    prices = [1.0, 2.0, 3.0]
+
+    with pytest.raises((ValueError, IndexError)):
+        tape.extend(timestamps, symbol_ids, prices, prices, prices, prices, prices, prices)
+
+    assert len(tape) == 1
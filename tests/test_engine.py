@@ -0,0 +1,236 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+from trading_bot import trading_core
+from trading_bot.engine import Bars, TradingEngine, scan_symbols
+
+
+@pytest.fixture
+def engine():
+    """Engine instance; no network access is needed for the pure-compute methods."""
+    return TradingEngine(symbol="BTC/USDT")
+
+
+@pytest.fixture
+def ohlcv():
+    """Synthetic OHLCV frame with a deterministic random-walk close."""
+    rng = np.random.default_rng(7)
+    close = 100.0 + np.cumsum(rng.normal(0, 1, 200))
+    return pd.DataFrame({
+        'timestamp': pd.date_range("2024-01-01", periods=200, freq="h"),
+        'open': close,
+        'high': close + 1.0,
+        'low': close - 1.0,
+        'close': close,
+        'volume': np.full(200, 10.0),
+    })
+
+
+def test_get_signals_combines_conditions(engine, ohlcv):
+    """
+    A bar is a Buy only when every active condition agrees
+    (close above SMA and RSI below the oversold threshold), and
+    symmetrically for Sell.
+    """
+    df = engine.add_indicators(ohlcv, sma_window=10)
+    df['RSI'] = np.linspace(0.0, 100.0, len(df))
+    df = engine.get_signals(df, sma_window=10, rsi_overbought=60, rsi_oversold=50)
+
+    above = df['close'] > df['SMA_10']
+    below = df['close'] < df['SMA_10']
+    expected = np.where(above & (df['RSI'] < 50), 1,
+                        np.where(below & (df['RSI'] > 60), -1, 0))
+
+    np.testing.assert_array_equal(df['Signal'].to_numpy(), expected)
+    assert df['Signal'].dtype == np.int8
+    assert set(np.unique(df['Signal'])) <= {-1, 0, 1}
+
+
+def test_add_indicators_adds_all_columns(engine, ohlcv):
+    """Every requested indicator lands in its own column with the input length."""
+    df = engine.add_indicators(ohlcv, sma_window=20, ema_window=10, rsi_window=14, bb_window=20)
+
+    for col in ['SMA_20', 'EMA_10', 'RSI', 'MACD', 'MACD_Signal', 'BB_High', 'BB_Mid', 'BB_Low']:
+        assert col in df.columns
+        assert len(df[col]) == len(ohlcv)
+        assert df[col].dtype == np.float32
+    assert df['RSI'].iloc[14:].between(0, 100).all()
+
+
+def test_get_signals_flat_series_holds(engine, ohlcv):
+    """float32 indicators of a flat series equal its close: no spurious crossovers."""
+    flat = ohlcv.assign(open=100.1, high=100.1, low=100.1, close=100.1)
+    df = engine.add_indicators(flat, sma_window=10, ema_window=5, bb_window=20)
+    df = engine.get_signals(df, sma_window=10, use_bbands=True)
+
+    assert (df['Signal'] == 0).all()
+    assert (engine.get_signals(df, sma_window=None, ema_window=5)['Signal'] == 0).all()
+
+
+def test_get_signals_warmup_rows_hold(engine, ohlcv):
+    """Rows where indicators are still NaN never trigger a trade."""
+    df = engine.add_indicators(ohlcv, sma_window=20, ema_window=5)
+    df = engine.get_signals(df, sma_window=20, ema_window=5)
+
+    assert (df['Signal'].iloc[:19] == 0).all()
+
+
+def test_run_backtest_matches_pandas_reference(engine, ohlcv):
+    """The fused backtest kernel reproduces the pandas pct_change/cumprod pipeline."""
+    df = ohlcv.copy()
+    df['Signal'] = np.where(np.arange(len(df)) % 3 == 0, 1, np.where(np.arange(len(df)) % 3 == 1, -1, 0))
+
+    result = engine.run_backtest(df, initial_balance=1000.0)
+    out = result['df']
+
+    market = df['close'].pct_change()
+    strategy = market * df['Signal'].shift(1)
+    cum_strategy = (1 + strategy).cumprod()
+    cum_max = cum_strategy.cummax()
+
+    np.testing.assert_allclose(out['market_returns'], market, rtol=1e-12)
+    np.testing.assert_allclose(out['strategy_returns'], strategy, rtol=1e-12)
+    np.testing.assert_allclose(out['cum_market_returns'], (1 + market).cumprod(), rtol=1e-9)
+    np.testing.assert_allclose(out['cum_strategy_returns'], cum_strategy, rtol=1e-9)
+    np.testing.assert_allclose(out['drawdown'], cum_strategy / cum_max - 1, rtol=1e-9, atol=1e-12)
+
+    assert result['final_balance'] == round(1000.0 * cum_strategy.iloc[-1], 2)
+    assert result['total_return_pct'] == round((cum_strategy.iloc[-1] - 1) * 100, 2)
+
+
+def test_engines_share_a_lazily_created_exchange():
+    """No client is built until first use, then engines on the same account share one."""
+    first, second = TradingEngine("BTC/USDT"), TradingEngine("ETH/USDT")
+    assert first._exchange is None
+
+    assert first.exchange is second.exchange
+    assert TradingEngine("BTC/USDT", api_key="k", api_secret="s").exchange is not first.exchange
+
+
+def test_exchange_clients_are_not_shared_across_threads():
+    """ccxt's sync client is not thread-safe: each thread gets its own, engines on it share it."""
+    engine = TradingEngine("BTC/USDT")
+    main_client = engine.exchange
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        worker_clients = list(pool.map(lambda e: (e.exchange, TradingEngine("ETH/USDT").exchange),
+                                       [engine, engine]))
+
+    for own, other in worker_clients:
+        assert own is other
+        assert own is not main_client
+    assert engine.exchange is main_client
+
+
+def test_bars_from_ohlcv_is_column_major():
+    """ccxt rows are split into one contiguous array per field and round-trip to a DataFrame."""
+    hour = 3_600_000
+    rows = [[i * hour, 1.0 + i, 2.0 + i, 0.5 + i, 1.5 + i, 10.0 * i] for i in range(5)]
+    bars = Bars.from_ohlcv(rows)
+
+    assert len(bars) == 5
+    assert bars.ts.dtype == np.int64
+    for col in (bars.ts, bars.open, bars.high, bars.low, bars.close, bars.volume):
+        assert col.flags['C_CONTIGUOUS']
+    np.testing.assert_array_equal(bars.close, [row[4] for row in rows])
+
+    df = bars.to_frame()
+    assert list(df.columns) == ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+    assert df['timestamp'].iloc[1] == pd.Timestamp(hour, unit='ms')
+    np.testing.assert_array_equal(Bars.from_frame(df).ts, bars.ts)
+
+
+def test_bars_timestamp_column_matches_to_datetime():
+    """The int64 view cast yields exactly pd.to_datetime(ms, unit='ms'), dtype and tz included."""
+    ms = np.array([0, 1, 1_700_000_000_123, 4_102_444_800_000], dtype=np.int64)
+    bars = Bars(ms, *(np.zeros(len(ms)) for _ in range(5)))
+
+    timestamps = bars.to_frame()['timestamp']
+
+    pd.testing.assert_series_equal(timestamps, pd.Series(pd.to_datetime(ms, unit='ms'), name='timestamp'))
+    assert timestamps.dt.tz is None
+
+
+def test_compute_indicators_matches_add_indicators(engine, ohlcv):
+    """The Bars path yields exactly the arrays add_indicators stores as columns."""
+    indicators = engine.compute_indicators(Bars.from_frame(ohlcv), sma_window=20, rsi_window=14, bb_window=20)
+    df = engine.add_indicators(ohlcv.copy(), sma_window=20, rsi_window=14, bb_window=20)
+
+    assert set(indicators) == {'SMA_20', 'RSI', 'MACD', 'MACD_Signal', 'BB_High', 'BB_Mid', 'BB_Low'}
+    for name, values in indicators.items():
+        np.testing.assert_array_equal(df[name].to_numpy(), values)
+
+
+class FakeExchange:
+    """Minimal stand-in for ccxt's fetch_ohlcv that records every request."""
+
+    def __init__(self, candles):
+        self.candles = candles
+        self.calls = []
+
+    def fetch_ohlcv(self, symbol, timeframe='1h', since=None, limit=None):
+        self.calls.append({'since': since, 'limit': limit})
+        rows = [c for c in self.candles if since is None or c[0] >= since]
+        return rows[-limit:] if since is None else rows[:limit]
+
+
+def test_fetch_data_requests_only_new_candles(engine):
+    """
+    The second fetch asks for candles since the last cached one and
+    merges the refreshed/new rows into the cached window.
+    """
+    hour = 3_600_000
+    candles = [[i * hour, 1.0, 2.0, 0.5, float(i), 10.0] for i in range(150)]
+    engine.exchange = FakeExchange(candles)
+
+    first = engine.fetch_data(timeframe='1h', limit=100)
+    assert len(first) == 100
+    assert engine.exchange.calls[-1]['since'] is None
+
+    # The last candle keeps forming and a new one closes
+    candles[-1] = [149 * hour, 1.0, 2.0, 0.5, 999.0, 10.0]
+    candles.append([150 * hour, 1.0, 2.0, 0.5, 150.0, 10.0])
+
+    second = engine.fetch_data(timeframe='1h', limit=100)
+    assert engine.exchange.calls[-1]['since'] == 149 * hour
+    assert len(second) == 100
+    assert second['close'].iloc[-2] == 999.0
+    assert second['close'].iloc[-1] == 150.0
+    assert second['timestamp'].iloc[0] == pd.Timestamp(51 * hour, unit='ms')
+
+    # Frames handed out earlier are never mutated by later merges
+    assert first['close'].iloc[-1] == 149.0
+
+
+def test_fetch_data_can_skip_pandas(engine):
+    """as_frame=False hands back the cached column arrays, ready for the C++ kernels."""
+    hour = 3_600_000
+    engine.exchange = FakeExchange([[i * hour, 1.0, 2.0, 0.5, float(i), 10.0] for i in range(50)])
+
+    data = engine.fetch_data(timeframe='1h', limit=50, as_frame=False)
+
+    assert list(data) == ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+    assert data['timestamp'].dtype == np.int64 and data['timestamp'][-1] == 49 * hour
+    assert data['close'].dtype == np.float64 and data['close'].flags['C_CONTIGUOUS']
+    np.testing.assert_array_equal(trading_core.calculate_sma(data['close'], 5)[4:], np.arange(2.0, 48.0))
+
+
+def test_scan_symbols_returns_signals_per_symbol():
+    """Every engine is fetched and analysed; results are keyed by symbol."""
+    hour = 3_600_000
+    engines = []
+    for symbol, drift in [("BTC/USDT", 1.0), ("ETH/USDT", -1.0)]:
+        engine = TradingEngine(symbol=symbol)
+        candles = [[i * hour, 1.0, 2.0, 0.5, 100.0 + drift * i, 10.0] for i in range(100)]
+        engine.exchange = FakeExchange(candles)
+        engines.append(engine)
+
+    results = scan_symbols(engines, timeframe='1h', limit=100, sma_window=20)
+
+    assert set(results) == {"BTC/USDT", "ETH/USDT"}
+    for engine in engines:
+        df = results[engine.symbol]
+        assert len(engine.exchange.calls) == 1
+        assert {'SMA_20', 'RSI', 'Signal'} <= set(df.columns)
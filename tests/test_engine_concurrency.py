@@ -1,5 +1,4 @@
 import pytest
-import time
 import numpy as np
 import os
 import sys
@@ -22,10 +21,7 @@ def test_market_manager_stress():
                 price = 100.0 + np.random.normal(0, 1)
                 manager.update_tick(symbol, price)
         
-        # Give threads time to finish
-        time.sleep(1)
-        
-        # Test passed: No segmentation faults so far
-        assert True 
+        # Wait for the threads to finish (returns as soon as they do)
+        assert manager.wait_until_idle(timeout=5.0)
     except Exception as e:
         pytest.fail(f"MarketManager crashed during stress test: {e}")
\ No newline at end of file
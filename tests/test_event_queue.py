@@ -28,4 +28,22 @@ def test_event_queue_chronological_order():
     popped_3 = queue.pop()
 
     assert popped_1.timestamp < popped_2.timestamp < popped_3.timestamp
-    assert queue.empty()
\ No newline at end of file
+    assert queue.empty()
+
+def test_event_queue_many_events_and_ties():
+    """
+    Pops a shuffled batch in timestamp order; events sharing a
+    timestamp come out in the order they were pushed
+    """
+    queue = bt.EventQueue()
+    timestamps = [(i * 7919) % 500 for i in range(1000)]  # Every value 0..499 twice, shuffled
+
+    for i, ts in enumerate(timestamps):
+        queue.push(ev.TickEvent(ev.make_timestamp(ts), f"S{i}", 1.0, 1.0, 1.0, 1.0, 1.0, 1.0))
+
+    popped = [queue.pop() for _ in range(len(timestamps))]
+
+    assert [e.timestamp for e in popped] == sorted(timestamps)
+    expected_symbols = [f"S{i}" for i, _ in sorted(enumerate(timestamps), key=lambda p: (p[1], p[0]))]
+    assert [e.symbol for e in popped] == expected_symbols
+    assert queue.empty()
@@ -0,0 +1,245 @@
+import numpy as np
+import pytest
+from trading_bot import trading_core
+
+
+@pytest.fixture
+def prices():
+    """Deterministic random-walk price series."""
+    rng = np.random.default_rng(42)
+    return 100.0 + np.cumsum(rng.normal(0, 1, 300))
+
+
+def test_sma_matches_reference(prices):
+    """
+    SMA must match a plain numpy rolling mean, with NaN
+    until the first full window.
+    """
+    window = 20
+    sma = trading_core.calculate_sma(prices, window)
+
+    expected = np.convolve(prices, np.ones(window) / window, mode="valid")
+
+    assert sma.dtype == np.float64
+    assert sma.shape == prices.shape
+    assert np.isnan(sma[: window - 1]).all()
+    np.testing.assert_allclose(sma[window - 1 :], expected, rtol=1e-9)
+
+
+def test_sma_accepts_non_contiguous_input(prices):
+    """Strided views are converted transparently before reaching the kernel."""
+    strided = prices[::2]
+    assert not strided.flags["C_CONTIGUOUS"]
+
+    sma = trading_core.calculate_sma(strided, 5)
+    expected = trading_core.calculate_sma(np.ascontiguousarray(strided), 5)
+
+    np.testing.assert_array_equal(sma, expected)
+
+
+def test_ema_matches_recursive_reference(prices):
+    """EMA is seeded with the first price and uses alpha = 2 / (window + 1)."""
+    window = 12
+    ema = trading_core.calculate_ema(prices, window)
+
+    alpha = 2.0 / (window + 1.0)
+    expected = np.empty_like(prices)
+    expected[0] = prices[0]
+    for i in range(1, len(prices)):
+        expected[i] = prices[i] * alpha + expected[i - 1] * (1.0 - alpha)
+
+    np.testing.assert_allclose(ema, expected, rtol=1e-12)
+
+
+def test_macd_matches_separate_emas(prices):
+    """
+    The fused MACD kernel must reproduce the textbook definition:
+    EMA(fast) - EMA(slow), with the signal line being an EMA of that difference.
+    """
+    macd_line, signal_line = trading_core.calculate_macd(prices, 12, 26, 9)
+
+    expected_macd = trading_core.calculate_ema(prices, 12) - trading_core.calculate_ema(prices, 26)
+    expected_signal = trading_core.calculate_ema(expected_macd, 9)
+
+    np.testing.assert_allclose(macd_line, expected_macd, rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(signal_line, expected_signal, rtol=1e-9, atol=1e-12)
+
+
+def test_bollinger_bands_match_rolling_std(prices):
+    """Bands are mean +/- k * population standard deviation over the window."""
+    window, k = 20, 2.0
+    upper, mid, lower = trading_core.calculate_bollinger_bands(prices, window, k)
+
+    windows = np.lib.stride_tricks.sliding_window_view(prices, window)
+    mean = windows.mean(axis=1)
+    std = windows.std(axis=1)
+
+    assert np.isnan(mid[: window - 1]).all()
+    np.testing.assert_allclose(mid[window - 1 :], mean, rtol=1e-9)
+    np.testing.assert_allclose(upper[window - 1 :], mean + k * std, rtol=1e-6)
+    np.testing.assert_allclose(lower[window - 1 :], mean - k * std, rtol=1e-6)
+
+
+def wilder_rsi_reference(prices, window):
+    """Pure-Python Wilder RSI: simple-mean seed, then (avg * (w - 1) + x) / w."""
+    diffs = np.diff(prices)
+    gains, losses = np.maximum(diffs, 0.0), np.maximum(-diffs, 0.0)
+    rsi = np.full(len(prices), np.nan)
+    avg_gain, avg_loss = gains[:window].mean(), losses[:window].mean()
+    for i in range(window, len(prices)):
+        if i > window:
+            avg_gain = (avg_gain * (window - 1) + gains[i - 1]) / window
+            avg_loss = (avg_loss * (window - 1) + losses[i - 1]) / window
+        rsi[i] = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    return rsi
+
+
+def test_rsi_matches_wilder_reference(prices):
+    """RSI uses Wilder's recursion; first valid value sits at index `window`."""
+    rsi = trading_core.calculate_rsi(prices, 14)
+    expected = wilder_rsi_reference(prices, 14)
+
+    assert np.isnan(rsi[:14]).all()
+    np.testing.assert_allclose(rsi[14:], expected[14:], rtol=1e-12)
+    assert ((rsi[14:] >= 0) & (rsi[14:] <= 100)).all()
+
+
+@pytest.mark.parametrize("name, args", [
+    ("sma", (20,)), ("ema", (12,)), ("rsi", (14,)), ("macd", (12, 26, 9)), ("bollinger_bands", (20, 2.0)),
+])
+def test_f32_variants_round_the_float64_results(prices, name, args):
+    """The *_f32 kernels accumulate in double and only round the stored values."""
+    expected = getattr(trading_core, f"calculate_{name}")(prices, *args)
+    result = getattr(trading_core, f"calculate_{name}_f32")(prices, *args)
+    if not isinstance(expected, tuple):
+        expected, result = (expected,), (result,)
+
+    for exp, res in zip(expected, result):
+        assert res.dtype == np.float32
+        np.testing.assert_allclose(res, exp, rtol=1e-6, atol=1e-6)
+
+
+@pytest.mark.parametrize("name, args", [
+    ("sma", (20,)), ("rsi", (14,)), ("bollinger_bands", (20, 2.0)), ("all", ()),
+])
+def test_f32_variants_accept_float32_input(prices, name, args):
+    """float32 series are read as is; the result equals feeding the same values as float64."""
+    prices32 = prices.astype(np.float32)
+    kernel = getattr(trading_core, f"calculate_{name}_f32")
+
+    result, expected = kernel(prices32, *args), kernel(prices32.astype(np.float64), *args)
+    if not isinstance(expected, tuple):
+        expected, result = (expected,), (result,)
+
+    for exp, res in zip(expected, result):
+        assert res.dtype == np.float32
+        np.testing.assert_allclose(res, exp, rtol=1e-6)
+
+
+@pytest.mark.parametrize("size", [300, 17, 1])
+def test_calculate_all_matches_separate_kernels(prices, size):
+    """The fused pass matches the three standalone kernels, warm-up NaNs included."""
+    data = prices[:size]
+    fused = trading_core.calculate_all(data, 14, 20, 2.0, 12, 26, 9)
+    separate = (
+        trading_core.calculate_rsi(data, 14),
+        *trading_core.calculate_macd(data, 12, 26, 9),
+        *trading_core.calculate_bollinger_bands(data, 20, 2.0),
+    )
+
+    assert len(fused) == 6
+    for res, exp in zip(fused, separate):
+        np.testing.assert_allclose(res, exp, rtol=1e-12)
+
+
+@pytest.mark.parametrize("rsi_window, bb_window", [(14, 20), (15, 21)])
+def test_standard_and_runtime_windows_match_references(prices, rsi_window, bb_window):
+    """The standard windows (compiled as constants) and any other window give the reference values."""
+    np.testing.assert_allclose(trading_core.calculate_rsi(prices, rsi_window)[rsi_window:],
+                               wilder_rsi_reference(prices, rsi_window)[rsi_window:], rtol=1e-12)
+
+    _, mid, _ = trading_core.calculate_bollinger_bands(prices, bb_window, 2.0)
+    mean = np.lib.stride_tricks.sliding_window_view(prices, bb_window).mean(axis=1)
+    np.testing.assert_allclose(mid[bb_window - 1:], mean, rtol=1e-9)
+
+    fused = trading_core.calculate_all(prices, rsi_window, bb_window)
+    np.testing.assert_allclose(fused[0], trading_core.calculate_rsi(prices, rsi_window), rtol=1e-12)
+    np.testing.assert_allclose(fused[4], mid, rtol=1e-12)
+
+
+def test_rsi_too_short_input_is_all_nan():
+    """Series shorter than the window produce no RSI values."""
+    rsi = trading_core.calculate_rsi(np.array([1.0, 2.0, 3.0]), 14)
+    assert np.isnan(rsi).all()
+
+
+STREAMS = [
+    (lambda: trading_core.RsiStream(14), lambda p: trading_core.calculate_rsi(p, 14)),
+    (lambda: trading_core.EmaStream(12), lambda p: trading_core.calculate_ema(p, 12)),
+    (lambda: trading_core.MacdStream(12, 26, 9), lambda p: trading_core.calculate_macd(p, 12, 26, 9)),
+    (lambda: trading_core.BollingerStream(20, 2.0), lambda p: trading_core.calculate_bollinger_bands(p, 20, 2.0)),
+]
+
+
+def as_columns(values):
+    """Normalises single arrays / scalars and tuples of them to a tuple."""
+    return values if isinstance(values, tuple) else (values,)
+
+
+@pytest.mark.parametrize("make_stream, batch", STREAMS)
+def test_stream_warmup_matches_batch(prices, make_stream, batch):
+    """warmup() reproduces the batch kernel over the whole history."""
+    result = as_columns(make_stream().warmup(prices))
+    expected = as_columns(batch(prices))
+
+    for res, exp in zip(result, expected):
+        np.testing.assert_allclose(res, exp, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize("make_stream, batch", STREAMS)
+def test_stream_update_last_replaces_or_appends(prices, make_stream, batch):
+    """
+    Replacing the forming close gives the tip of the batch kernel over the
+    replaced series; appending commits it and extends the series.
+    """
+    stream = make_stream()
+    stream.warmup(prices[:-1])
+
+    # The forming candle ticks: replace its close
+    stream.update_last(prices[-2] + 3.0)
+    tip = as_columns(stream.update_last(prices[-2] - 1.5))
+    replaced = prices[:-1].copy()
+    replaced[-1] -= 1.5
+    for value, exp in zip(tip, as_columns(batch(replaced))):
+        assert value == pytest.approx(exp[-1], rel=1e-9)
+
+    # A new candle opens
+    tip = as_columns(stream.update_last(prices[-1], append=True))
+    appended = np.append(replaced, prices[-1])
+    for value, exp in zip(tip, as_columns(batch(appended))):
+        assert value == pytest.approx(exp[-1], rel=1e-9)
+
+
+@pytest.mark.parametrize("make_stream", [
+    lambda: trading_core.RsiStream(0),
+    lambda: trading_core.EmaStream(0),
+    lambda: trading_core.MacdStream(12, 0, 9),
+    lambda: trading_core.BollingerStream(0, 2.0),
+    lambda: trading_core.BollingerStream(-1, 2.0),
+])
+def test_stream_rejects_empty_window(make_stream):
+    """A window below 1 is refused up front instead of failing on the first update."""
+    with pytest.raises(ValueError, match="window"):
+        make_stream()
+
+
+@pytest.mark.parametrize("name, args", [("sma", (20,)), ("rsi", (14,)), ("all", ())])
+def test_f32_variants_never_narrow_list_input(prices, name, args):
+    """A list is converted to float64, like any non-float32 input, before the kernel runs."""
+    kernel = getattr(trading_core, f"calculate_{name}_f32")
+    result, expected = kernel(prices.tolist(), *args), kernel(prices, *args)
+    if not isinstance(expected, tuple):
+        expected, result = (expected,), (result,)
+
+    for exp, res in zip(expected, result):
+        np.testing.assert_array_equal(res, exp)
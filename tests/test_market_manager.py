@@ -1,5 +1,5 @@
+import numpy as np
 import pytest
-import time
 from trading_bot import trading_core
 
 def test_market_manager_concurrency():
@@ -7,13 +7,179 @@ def test_market_manager_concurrency():
     manager = trading_core.MarketManager(4)
     symbols = ["BTC/USDT", "ETH/USDT"]
     
-    # Act
-    for _ in range(100):
-        for s in symbols:
-            manager.update_tick(s, 50000.0)
+    # Act: one call per symbol for the whole batch
+    for s in symbols:
+        manager.update_ticks(s, np.full(100, 50000.0))
     
-    time.sleep(0.1) # Breve pausa para los hilos
+    assert manager.wait_until_idle(timeout=1.0)
     
     # Assert
     assert manager.get_last_price("BTC/USDT") == 50000.0
-    assert manager.get_last_price("ETH/USDT") == 50000.0
\ No newline at end of file
+    assert manager.get_last_price("ETH/USDT") == 50000.0
+
+def test_update_candle_replaces_forming_candle():
+    # Arrange: a single worker keeps the updates in order
+    manager = trading_core.MarketManager(1)
+    minute = 60_000
+
+    # Act: the same candle ticks twice, then a stale update arrives
+    manager.update_candle("BTC/USDT", minute, 100.0)
+    manager.update_candle("BTC/USDT", minute, 101.0)
+    manager.update_candle("BTC/USDT", 0, 50.0)
+    assert manager.wait_until_idle(timeout=1.0)
+
+    # Assert: the forming candle was overwritten and the stale update ignored
+    assert manager.get_last_price("BTC/USDT") == 101.0
+
+    # A newer candle opens
+    manager.update_candle("BTC/USDT", 2 * minute, 102.0)
+    assert manager.wait_until_idle(timeout=1.0)
+    assert manager.get_last_price("BTC/USDT") == 102.0
+
+def test_update_tick_bursts_past_ring_capacity():
+    # Arrange: more ticks than a symbol's ring holds, on several workers
+    manager = trading_core.MarketManager(4)
+
+    # Act: a full ring makes the producer wait for the drain instead of dropping ticks
+    for i in range(5000):
+        manager.update_tick("BTC/USDT", float(i))
+    assert manager.wait_until_idle(timeout=1.0)
+
+    # Assert
+    assert manager.get_last_price("BTC/USDT") == 4999.0
+    assert manager.get_last_price("UNKNOWN") == 0.0
+
+def test_push_racing_the_end_of_a_drain_is_not_lost():
+    # Arrange: every push lands right as the previous drain is clearing its flag
+    manager = trading_core.MarketManager(2)
+
+    # Act / Assert: a lost wake-up would leave the tick queued and the wait timing out
+    for i in range(20000):
+        manager.update_tick("BTC/USDT", float(i))  # Ring never full: the try_ fast path
+        assert manager.wait_until_idle(timeout=1.0), f"tick {i} was never drained"
+    assert manager.get_last_price("BTC/USDT") == 19999.0
+
+def test_update_ticks_multi_keeps_per_symbol_order():
+    # Arrange
+    manager = trading_core.MarketManager(4)
+
+    # Act: batches larger than a ring, for two symbols, in one call
+    manager.update_ticks_multi({"BTC/USDT": np.arange(5000.0), "ETH/USDT": np.arange(3000.0)})
+    assert manager.wait_until_idle(timeout=1.0)
+
+    # Assert: the last price of each batch is the last one applied
+    assert manager.get_last_price("BTC/USDT") == 4999.0
+    assert manager.get_last_price("ETH/USDT") == 2999.0
+
+def test_symbol_ids_address_the_same_state():
+    # Arrange: ids are dense and registering twice returns the same one
+    manager = trading_core.MarketManager(2)
+    btc, eth = manager.register_symbol("BTC/USDT"), manager.register_symbol("ETH/USDT")
+    assert (btc, eth) == (0, 1)
+    assert manager.register_symbol("BTC/USDT") == btc
+
+    # Act: id and string updates land on the same symbol
+    manager.update_tick_id(btc, 50000.0)
+    manager.update_candle_id(eth, 60_000, 3000.0)
+    assert manager.wait_until_idle(timeout=1.0)
+
+    # Assert
+    assert manager.get_last_price("BTC/USDT") == 50000.0
+    assert manager.get_last_price("ETH/USDT") == 3000.0
+    with pytest.raises(IndexError):
+        manager.update_tick_id(7, 1.0)
+
+def test_update_candles_id_dispatches_a_mixed_batch():
+    # Arrange
+    manager = trading_core.MarketManager(2)
+    btc, eth = manager.register_symbol("BTC/USDT"), manager.register_symbol("ETH/USDT")
+    minute = 60_000
+
+    # Act: interleaved symbols, each with a forming candle and a stale update
+    manager.update_candles_id([(btc, minute, 100.0), (eth, minute, 10.0), (btc, minute, 101.0),
+                               (eth, 2 * minute, 11.0), (btc, 0, 50.0)])
+    assert manager.wait_until_idle(timeout=1.0)
+
+    # Assert: per-symbol order was kept
+    assert manager.get_last_price("BTC/USDT") == 101.0
+    assert manager.get_last_price("ETH/USDT") == 11.0
+    with pytest.raises(IndexError):
+        manager.update_candles_id([(7, minute, 1.0)])
+
+@pytest.fixture
+def signal_log():
+    """SIGNAL messages logged while the test runs; the global callback is always cleared."""
+    captured = []
+    trading_core.set_log_callback(
+        lambda level, msg: captured.append(msg) if level == trading_core.LogLevel.SIGNAL else None)
+    yield captured
+    trading_core.set_log_callback(None)
+
+def test_signals_are_logged_on_change_only(signal_log):
+    # Arrange: a symbol whose RSI stays oversold during a long drop
+    manager = trading_core.MarketManager(1)
+
+    # Act
+    manager.update_ticks("BTC/USDT", np.concatenate([np.full(50, 100.0), np.linspace(95.0, 40.0, 20)]))
+    assert manager.wait_until_idle(timeout=1.0)
+
+    # Assert: the persistent BUY was reported once, not once per tick
+    actions = [msg.rsplit(" ", 1)[-1] for msg in signal_log]
+    assert actions.count("BUY") == 1
+
+def test_incremental_indicators_match_batch_kernels():
+    # Arrange: a random walk ending in a sharp drop, so the last tick holds a BUY
+    rng = np.random.default_rng(3)
+    prices = np.concatenate([100.0 + np.cumsum(rng.normal(0, 1, 120)), np.linspace(90.0, 60.0, 8)])
+    manager = trading_core.MarketManager(2)
+
+    # Act: one O(1) indicator update per tick on the worker side
+    manager.update_ticks("BTC/USDT", prices)
+    assert manager.wait_until_idle(timeout=1.0)
+    state = manager.get_indicators("BTC/USDT")
+
+    # Assert: the streamed state equals the batch kernels over the same prices
+    rsi = trading_core.calculate_rsi(prices, 14)
+    upper, mid, lower = trading_core.calculate_bollinger_bands(prices, 20, 2.0)
+    assert state.count == len(prices)
+    assert state.price == prices[-1]
+    assert state.rsi == pytest.approx(rsi[-1], rel=1e-9)
+    assert (state.upper, state.mid, state.lower) == pytest.approx((upper[-1], mid[-1], lower[-1]), rel=1e-9)
+    assert state.signal == trading_core.check_signals(rsi, prices, upper, lower) == 1
+
+def test_history_ring_wraps_past_max_history():
+    # Arrange: more candles than the 200-slot history ring holds
+    manager = trading_core.MarketManager(1)
+    minute = 60_000
+    closes = 100.0 + np.sin(np.arange(450) / 7.0)
+
+    # Act: the last candle keeps forming after the ring has wrapped twice, then a stale update
+    for i, close in enumerate(closes):
+        manager.update_candle("BTC/USDT", i * minute, close)
+    manager.update_candle("BTC/USDT", 449 * minute, 101.5)
+    manager.update_candle("BTC/USDT", 200 * minute, 1.0)
+    assert manager.wait_until_idle(timeout=1.0)
+    state = manager.get_indicators("BTC/USDT")
+
+    # Assert: the count saturates and the forming slot is found across the wrap
+    closes[-1] = 101.5
+    assert state.count == 200
+    assert state.price == manager.get_last_price("BTC/USDT") == 101.5
+    assert state.mid == pytest.approx(trading_core.calculate_bollinger_bands(closes, 20, 2.0)[1][-1], rel=1e-9)
+
+def test_signals_wait_for_26_prices():
+    # Arrange: a crash that satisfies the BUY conditions from the 25th price on
+    manager = trading_core.MarketManager(1)
+    prices = np.array([100.0] * 20 + [95.0, 90.0, 85.0, 80.0, 70.0, 60.0])
+    rsi = trading_core.calculate_rsi(prices, 14)
+    upper, _, lower = trading_core.calculate_bollinger_bands(prices, 20, 2.0)
+    assert trading_core.check_signals(rsi[:25], prices[:25], upper[:25], lower[:25]) == 1
+
+    # Act / Assert: held until MACD's 26 prices are in
+    manager.update_ticks("BTC/USDT", prices[:25])
+    assert manager.wait_until_idle(timeout=1.0)
+    assert (manager.get_indicators("BTC/USDT").count, manager.get_indicators("BTC/USDT").signal) == (25, 0)
+
+    manager.update_tick("BTC/USDT", prices[25])
+    assert manager.wait_until_idle(timeout=1.0)
+    assert (manager.get_indicators("BTC/USDT").count, manager.get_indicators("BTC/USDT").signal) == (26, 1)
@@ -0,0 +1,137 @@
+import asyncio
+import io
+
+import pytest
+
+from trading_bot.monitor import StatusLine, dispatch_loop, price_tick, stream_loop
+
+
+def test_status_line_is_rate_limited():
+    """The first update renders immediately; later ones only refresh the cells until the interval passes."""
+    out = io.BytesIO()
+    status = StatusLine(["BTC/USDT", "ETH/USDT"], interval=60.0, out=out)
+
+    status.update("BTC/USDT", 50000.0)
+    status.update("ETH/USDT", 3000.0)
+
+    assert out.getvalue() == b"BTC/USDT   |   50000.00 || ETH/USDT   |        ---\r"
+
+    status._next_render = 0.0
+    status.update("BTC/USDT", 50001.5)
+    assert out.getvalue().endswith(b"BTC/USDT   |   50001.50 || ETH/USDT   |    3000.00\r")
+
+
+def test_status_line_draws_throttled_updates_once_the_interval_elapses():
+    """An update inside the interval is not lost when the stream goes quiet afterwards."""
+    out, now = io.BytesIO(), [100.0]
+    status = StatusLine(["BTC/USDT"], interval=0.02, out=out, clock=lambda: now[0])
+
+    async def scenario():
+        status.update("BTC/USDT", 50000.0)
+        now[0] += 0.005
+        status.update("BTC/USDT", 50001.5)
+        status.update("BTC/USDT", 50002.5)
+        assert out.getvalue() == b"BTC/USDT   |   50000.00\r"
+
+        # No further tick arrives: the trailing render shows the latest close, once
+        now[0] += 0.02
+        await asyncio.sleep(0.1)
+
+    asyncio.run(scenario())
+    assert out.getvalue() == b"BTC/USDT   |   50000.00\rBTC/USDT   |   50002.50\r"
+
+
+def test_price_tick_handles_both_precision_modes():
+    """ccxt reports the tick itself, or a number of decimal places."""
+    assert price_tick({'precision': {'price': 0.01}}) == 0.01
+    assert price_tick({'precision': {'price': 2}}, digits=True) == pytest.approx(0.01)
+    assert price_tick({'precision': {}}) == 0.0
+    assert price_tick(None) == 0.0
+
+
+class FakeStream:
+    """Replays canned watch_ohlcv_for_symbols updates, then stops the loop."""
+
+    def __init__(self, updates):
+        self.updates = list(updates)
+
+    async def watch_ohlcv_for_symbols(self, subscriptions):
+        if not self.updates:
+            raise asyncio.CancelledError
+        return self.updates.pop(0)
+
+
+class RecordingManager:
+    """Stand-in for MarketManager that records the batches dispatched to it."""
+
+    def __init__(self):
+        self.batches = []
+
+    def register_symbol(self, symbol):
+        return 0
+
+    def update_candles_id(self, batch):
+        self.batches.append(batch)
+
+
+def test_stream_loop_skips_sub_tick_moves():
+    """Moves of the forming candle below the tick size are dropped; a new candle always goes through."""
+    minute = 60_000
+    closes = [(minute, 100.00), (minute, 100.004), (minute, 100.01), (2 * minute, 100.01)]
+    exchange = FakeStream({"BTC/USDT": {'1m': [[ts, 0, 0, 0, close, 0]]}} for ts, close in closes)
+    queue = asyncio.Queue()
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(stream_loop(exchange, ["BTC/USDT"], RecordingManager(), {}, queue,
+                                tick_sizes={"BTC/USDT": 0.01}))
+
+    queued = [queue.get_nowait() for _ in range(queue.qsize())]
+    assert queued == [(0, minute, 100.00), (0, minute, 100.01), (0, 2 * minute, 100.01)]
+
+
+def test_dispatch_loop_batches_in_order():
+    """Whatever is queued is dispatched in arrival order, at most `max_batch` entries per call."""
+    manager = RecordingManager()
+    entries = [(0, i, float(i)) for i in range(100)]
+
+    async def scenario():
+        queue = asyncio.Queue()
+        for entry in entries:
+            queue.put_nowait(entry)
+        dispatcher = asyncio.create_task(dispatch_loop(queue, manager, max_batch=64))
+        while not queue.empty():
+            await asyncio.sleep(0)
+        dispatcher.cancel()
+
+    asyncio.run(scenario())
+
+    assert [len(batch) for batch in manager.batches] == [64, 36]
+    assert [entry for batch in manager.batches for entry in batch] == entries
+
+
+class FailingManager(RecordingManager):
+    """MarketManager stand-in whose dispatch always raises."""
+
+    def update_candles_id(self, batch):
+        super().update_candles_id(batch)
+        raise IndexError("MarketManager: unknown symbol id")
+
+
+def test_dispatch_loop_survives_manager_errors(capsys):
+    """A failing batch is logged and dropped; the producer never blocks on a full queue."""
+    manager = FailingManager()
+    entries = [(7, i, float(i)) for i in range(50)]
+
+    async def scenario():
+        queue = asyncio.Queue(maxsize=4)
+        dispatcher = asyncio.create_task(dispatch_loop(queue, manager, max_batch=4))
+        for entry in entries:
+            await asyncio.wait_for(queue.put(entry), timeout=1.0)
+        while not queue.empty():
+            await asyncio.sleep(0)
+        dispatcher.cancel()
+
+    asyncio.run(scenario())
+
+    assert [entry for batch in manager.batches for entry in batch] == entries
+    assert "[!] Error dispatching" in capsys.readouterr().out
@@ -45,4 +45,30 @@ def test_custom_slippage_model_from_python():
     fills = exec_engine.get_fills()
     assert len(fills) == 1
     assert fills[0].fill_price == 105.0
-    assert fills[0].slippage == 5.0
\ No newline at end of file
+    assert fills[0].slippage == 5.0
+
+
+def test_native_slippage_models_skip_python():
+    """
+    Built-in models price fills in C++ and match their closed forms:
+    the fixed offset reproduces the Python lambda above.
+    """
+    expected = {
+        bt.SlippageKind.FixedOffset: (5.0, 105.0),
+        bt.SlippageKind.Linear: (0.1, 100.0 * (1 + 0.1 * 10.0 / 200.0)),
+        bt.SlippageKind.SqrtImpact: (0.1, 100.0 * (1 + 0.1 * (10.0 / 200.0) ** 0.5)),
+    }
+
+    for kind, (coefficient, price) in expected.items():
+        queue = bt.EventQueue()
+        exec_engine = bt.ExecutionEngine(queue, kind, coefficient=coefficient)
+        engine = bt.BacktestEngine(queue, exec_engine)
+        engine.push_event(ev.TickEvent(ev.make_timestamp(1), "SOL", 99.0, 101.0, 100.0, 100.0, 100.0, 1.0))
+        engine.push_event(ev.OrderEvent(
+            1, ev.make_timestamp(2), "SOL", ev.Side.BUY, 10.0, 0.0, ev.OrderStatus.SUBMITTED, "native",
+        ))
+        engine.run()
+
+        fills = exec_engine.get_fills()
+        assert len(fills) == 1
+        assert abs(fills[0].fill_price - price) < 1e-9
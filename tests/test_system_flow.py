@@ -1,5 +1,5 @@
 import pytest
-import time
+import threading
 from trading_bot import trading_core
 
 def test_full_signal_generation_flow():
@@ -9,10 +9,12 @@ def test_full_signal_generation_flow():
     """
     # 1. Setup
     captured_signals = []
+    signal_ready = threading.Event()
     def test_log_callback(level, msg):
         # Only store if level is SIGNAL
         if level == trading_core.LogLevel.SIGNAL:
             captured_signals.append(msg)
+            signal_ready.set()
 
     # Inject callback
     trading_core.set_log_callback(test_log_callback)
@@ -30,12 +32,10 @@ def test_full_signal_generation_flow():
     for p in prices:
         manager.update_tick(symbol, p)
     
-    # 4. Small delay to allow the ThreadPool to process
-    timeout = 1.0
-    start = time.time()
-    while len(captured_signals) == 0 and (time.time() - start) < timeout:
-        # while loop: active wait
-        time.sleep(0.05)    
+    # 4. Wake up as soon as the ThreadPool publishes a signal, then let it
+    # finish the remaining ticks (no polling)
+    assert signal_ready.wait(timeout=1.0), "No signal detected during price drop."
+    assert manager.wait_until_idle(timeout=1.0)
 
     # 5. Verification
     # Check that the engine is alive and responsive
@@ -1,38 +1,214 @@
 import ccxt
 import pandas as pd
 import numpy as np
-import ta
 import os
-import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
 from trading_bot import trading_core
 
-class TradingEngine:
-    def __init__(self, symbol='BTC/USDT', api_key = None, api_secret = None):
+
+# dtype of pd.to_datetime(epoch_ms, unit='ms'): datetime64[ns] up to pandas 2, datetime64[ms] from 3
+_MS_TIMESTAMP_DTYPE = pd.to_datetime(np.zeros(1, dtype=np.int64), unit='ms').dtype
+
+
+@dataclass(frozen=True)
+class Bars:
+    """OHLCV candles stored column-wise (structure of arrays).
+    Every field is its own contiguous 1-D array, so kernels that only need `close`
+    read exactly those bytes; a DataFrame is only built at the API boundary.
+    :param ts: Candle open times in epoch milliseconds (int64)
+    :param open: Open prices (float64)
+    :param high: High prices (float64)
+    :param low: Low prices (float64)
+    :param close: Close prices (float64)
+    :param volume: Traded volume (float64)
+    """
+    ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+    @classmethod
+    def from_ohlcv(cls, rows):
+        """Parses ccxt's list of [timestamp, o, h, l, c, v] rows.
+        :param rows: OHLCV rows as returned by fetch_ohlcv
+        :returns: Bars
+        """
+        # One (N, 6) parse, then a single transpose copy so each column is contiguous
+        columns = np.ascontiguousarray(np.asarray(rows, dtype=np.float64).reshape(-1, 6).T)
+        return cls(columns[0].astype(np.int64), *columns[1:])
+
+    @classmethod
+    def from_frame(cls, df):
+        """Wraps the columns of an OHLCV DataFrame (float columns are not copied).
+        :param df: DataFrame with timestamp/open/high/low/close/volume columns
+        :returns: Bars
+        """
+        ts = df['timestamp'].to_numpy()
+        if np.issubdtype(ts.dtype, np.datetime64):
+            ts = ts.astype('datetime64[ms]').view(np.int64)
+        return cls(ts, *(df[col].to_numpy(dtype=np.float64) for col in cls.COLUMNS[1:]))
+
+    def __len__(self):
+        return len(self.ts)
+
+    def _map(self, fn):
+        return Bars(*(fn(getattr(self, f.name)) for f in fields(self)))
+
+    def take(self, index):
+        """Returns the candles selected by a slice, mask or index array."""
+        return self._map(lambda col: col[index])
+
+    def tail(self, n):
+        """Returns the last `n` candles."""
+        return self.take(slice(-n, None))
+
+    def concat(self, other):
+        """Returns a new Bars with `other` appended after these candles."""
+        return Bars(*(np.concatenate([getattr(self, f.name), getattr(other, f.name)])
+                      for f in fields(self)))
+
+    def to_dict(self):
+        """Returns the columns keyed by name, without copying them.
+        :returns: dict of timestamp (int64 ms), open, high, low, close, volume arrays.
+        """
+        return dict(zip(self.COLUMNS, (self.ts, self.open, self.high, self.low,
+                                       self.close, self.volume)))
+
+    def to_frame(self):
+        """Materialises the candles as a DataFrame.
+        :returns: A DataFrame with OHLCV data.
+        """
+        df = pd.DataFrame(dict(zip(self.COLUMNS[1:], (self.open, self.high, self.low,
+                                                      self.close, self.volume))))
+        # ccxt timestamps already are epoch milliseconds: reinterpret them instead of parsing.
+        # Same column as pd.to_datetime(ts, unit='ms'): naive (UTC wall time), at the
+        # resolution this pandas version picks for it
+        ts = np.asarray(self.ts, dtype=np.int64).view('datetime64[ms]').astype(_MS_TIMESTAMP_DTYPE)
+        df.insert(0, 'timestamp', ts)
+        return df
+
+
+def _as_dtype_of(close, indicator):
+    """Close prices rounded to the indicator's dtype before a price-level comparison.
+    A float32 SMA/EMA/band of a flat series equals float32(close), not the float64
+    close itself: comparing at the indicator's precision keeps rounding from
+    reading as a crossover.
+    :param close: float64 close prices
+    :param indicator: indicator values parallel to `close`
+    :returns: `close`, cast to `indicator.dtype` if it differs.
+    """
+    return close.astype(indicator.dtype, copy=False)
+
+
+_thread_clients = threading.local()
+
+
+def _shared_exchange(api_key=None, api_secret=None):
+    """Shared ccxt client per set of credentials and per thread.
+    ccxt's synchronous clients are not thread-safe (rate limiter timestamps, the
+    lazy load_markets, the requests.Session), so a client is never used from two
+    threads. Within a thread, every engine on the same account reuses one HTTP
+    session (pooled keep-alive connections) and one markets table, loaded once on
+    the first request. enableRateLimit therefore throttles each thread's client
+    separately: N threads may together issue up to N times the per-client rate.
+    :param api_key: API key, or None for public endpoints
+    :param api_secret: API secret, or None for public endpoints
+    :returns: A ccxt.binance instance owned by the calling thread.
+    """
+    clients = getattr(_thread_clients, 'clients', None)
+    if clients is None:
+        clients = _thread_clients.clients = {}
+
+    exchange = clients.get((api_key, api_secret))
+    if exchange is None:
         # Using enableRateLimit is essential for production bots
-        self.exchange = ccxt.binance({
+        exchange = ccxt.binance({
             'apiKey': api_key,
             'secret': api_secret,
             'enableRateLimit': True,
             'options': {'defaultType': 'spot'}
         })
-        self.exchange.set_sandbox_mode(True) # Uncomment for Testnet / Paper trading
+        exchange.set_sandbox_mode(True) # Uncomment for Testnet / Paper trading
+        exchange.session.headers['Connection'] = 'keep-alive'
+        clients[(api_key, api_secret)] = exchange
+    return exchange
+
+
+class TradingEngine:
+    def __init__(self, symbol='BTC/USDT', api_key = None, api_secret = None):
+        # The exchange client is only created (or looked up) on first use
+        self._credentials = (api_key, api_secret)
+        self._exchange = None
         self.symbol = symbol
 
-    def fetch_data(self, timeframe='1h', limit=100):
+        # OHLCV cache (Bars) for one (timeframe, limit)
+        self._bars = None
+        self._bars_key = None
+        self._last_ts = None
+
+    @property
+    def exchange(self):
+        """ccxt client, shared with every other engine using the same credentials
+        on the calling thread (looked up on each access, never cached on the engine,
+        so an engine handed to another thread switches to that thread's client).
+        """
+        if self._exchange is not None:
+            return self._exchange
+        return _shared_exchange(*self._credentials)
+
+    @exchange.setter
+    def exchange(self, exchange):
+        self._exchange = exchange
+
+    def fetch_data(self, timeframe='1h', limit=100, as_frame=True):
         """Fetches historical OHLCV data.
+        Repeated calls with the same timeframe and limit only download the candles from
+        the last cached one onwards (it may still have been forming) and merge them in.
         :param timeframe: Timeframe for OHLCV data (e.g., '1h', '15m')
         :param limit: Number of data points to fetch
-        :returns: A DataFrame with OHLCV data.
+        :param as_frame: False to skip pandas and get the column arrays directly
+        :returns: A DataFrame with OHLCV data, or a dict of contiguous 1-D arrays
+        (int64 epoch-ms 'timestamp', float64 prices and volume) when `as_frame` is False.
         """
-        bars = self.exchange.fetch_ohlcv(self.symbol, timeframe=timeframe, limit=limit)
-        df = pd.DataFrame(bars, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        return df
+        bars = self.fetch_bars(timeframe, limit)
+        return bars.to_frame() if as_frame else bars.to_dict()
 
-    def add_indicators(self, df, sma_window=20, ema_window=None, rsi_window=None,
-                        macd_fast=12, macd_slow=26, macd_signal=9, bb_window=None):
-        """Computes a number of indicators.
-        :param df: DataFrame with OHLCV data
+    def fetch_bars(self, timeframe='1h', limit=100):
+        """Returns the most recent `limit` candles as Bars, downloading only the delta when cached.
+        :param timeframe: Timeframe for OHLCV data (e.g., '1h', '15m')
+        :param limit: Number of data points to keep
+        :returns: Bars, oldest candle first.
+        """
+        if self._bars is not None and self._bars_key == (timeframe, limit):
+            delta = self.exchange.fetch_ohlcv(self.symbol, timeframe=timeframe,
+                                              since=self._last_ts, limit=limit)
+            if not delta:
+                return self._bars
+            # A full page means we may have missed candles: fall back to a full refresh
+            if len(delta) < limit:
+                delta = Bars.from_ohlcv(delta)
+                # New arrays on every merge: bars returned earlier never change under the caller
+                kept = self._bars.take(self._bars.ts < delta.ts[0])
+                self._bars = kept.concat(delta).tail(limit)
+                self._last_ts = int(self._bars.ts[-1])
+                return self._bars
+
+        bars = Bars.from_ohlcv(self.exchange.fetch_ohlcv(self.symbol, timeframe=timeframe, limit=limit))
+        if len(bars):
+            self._bars, self._bars_key, self._last_ts = bars, (timeframe, limit), int(bars.ts[-1])
+        return bars
+
+    def compute_indicators(self, bars, sma_window=20, ema_window=None, rsi_window=None,
+                           macd_fast=12, macd_slow=26, macd_signal=9, bb_window=None):
+        """Computes a number of indicators straight from the close array.
+        :param bars: Bars with the OHLCV data
         :param sma_window: Window for Simple Moving Average
         :param ema_window: Window for Exponential Moving Average
         :param rsi_window: Window for Relative Strength Index
@@ -40,44 +216,79 @@ class TradingEngine:
         :param macd_slow: Slow period for MACD
         :param macd_signal: Signal period for MACD
         :param bb_window: Window for Bollinger Bands
-        :returns: DataFrame with new indicator columns.
+        :returns: A dictionary of float32 indicator arrays, parallel to `bars.close`
+        (empty when there is not enough data).
         """
-
-        
         # Guard clause: ensure we have enough data
         max_period = max(filter(None, [sma_window, ema_window, rsi_window, macd_slow, bb_window]))
-        if len(df) < max_period:
-            return df
-        
-        # C++ interoperability: get numpy array as float64 array
-        close_prices = np.ascontiguousarray(df['close'].values.astype(np.float64))
+        if len(bars) < max_period:
+            return {}
+
+        # C++ interoperability: one contiguous float64 buffer shared by every kernel.
+        # Bars columns already are, so this is a no-op on the hot path. The kernels
+        # accumulate in double but store float32: half the bytes for every consumer.
+        close_prices = np.ascontiguousarray(bars.close, dtype=np.float64)
+        indicators = {}
 
         # Simple Moving Average
         if sma_window:
-            df[f'SMA_{sma_window}'] = trading_core.calculate_sma(close_prices, sma_window)
+            indicators[f'SMA_{sma_window}'] = trading_core.calculate_sma_f32(close_prices, sma_window)
 
         # Exponential Moving Average
         if ema_window:
-            df[f'EMA_{ema_window}'] = trading_core.calculate_ema(close_prices, ema_window)
+            indicators[f'EMA_{ema_window}'] = trading_core.calculate_ema_f32(close_prices, ema_window)
+
+        use_macd = all([macd_fast, macd_slow, macd_signal])
+
+        if rsi_window and bb_window and use_macd:
+            # Fused kernel: RSI, MACD and Bollinger Bands from a single pass over the closes
+            (indicators['RSI'], indicators['MACD'], indicators['MACD_Signal'],
+             indicators['BB_High'], indicators['BB_Mid'], indicators['BB_Low']) = trading_core.calculate_all_f32(
+                close_prices, rsi_window, bb_window, 2.0, macd_fast, macd_slow, macd_signal
+            )
+            return indicators
 
         # Relative Strength Index
         if rsi_window:
-            df['RSI'] = trading_core.calculate_rsi(close_prices, rsi_window)
+            indicators['RSI'] = trading_core.calculate_rsi_f32(close_prices, rsi_window)
 
         # Moving Average Convergence Divergence
-        if all([macd_fast, macd_slow, macd_signal]):
-            macd_line, signal_line = trading_core.calculate_macd(
+        if use_macd:
+            macd_line, signal_line = trading_core.calculate_macd_f32(
                 close_prices, macd_fast, macd_slow, macd_signal
             )
-            df['MACD'] = macd_line
-            df['MACD_Signal'] = signal_line
-        
+            indicators['MACD'] = macd_line
+            indicators['MACD_Signal'] = signal_line
+
         # Bollinger Bands
         if bb_window:
-            upper, mid, lower = trading_core.calculate_bollinger_bands(close_prices, bb_window, 2.0)
-            df['BB_High'] = upper
-            df['BB_Mid'] = mid  
-            df['BB_Low'] = lower           
+            upper, mid, lower = trading_core.calculate_bollinger_bands_f32(close_prices, bb_window, 2.0)
+            indicators['BB_High'] = upper
+            indicators['BB_Mid'] = mid
+            indicators['BB_Low'] = lower
+
+        return indicators
+
+    def add_indicators(self, df, sma_window=20, ema_window=None, rsi_window=None,
+                        macd_fast=12, macd_slow=26, macd_signal=9, bb_window=None):
+        """Computes a number of indicators.
+        :param df: DataFrame with OHLCV data
+        :param sma_window: Window for Simple Moving Average
+        :param ema_window: Window for Exponential Moving Average
+        :param rsi_window: Window for Relative Strength Index
+        :param macd_fast: Fast period for MACD
+        :param macd_slow: Slow period for MACD
+        :param macd_signal: Signal period for MACD
+        :param bb_window: Window for Bollinger Bands
+        :returns: DataFrame with new indicator columns.
+        """
+        indicators = self.compute_indicators(
+            Bars.from_frame(df), sma_window=sma_window, ema_window=ema_window,
+            rsi_window=rsi_window, macd_fast=macd_fast, macd_slow=macd_slow,
+            macd_signal=macd_signal, bb_window=bb_window,
+        )
+        for name, values in indicators.items():
+            df[name] = values
 
         return df
 
@@ -94,39 +305,48 @@ class TradingEngine:
         1 for Buy, -1 for Sell, 0 for Hold
         """
         col_sma = f'SMA_{sma_window}' if sma_window else None
-        df['Signal'] = 0  # Default to Hold
 
-        buy_condition = pd.Series(True, index=df.index) # Buy condition starts as True
-        sell_condition = pd.Series(True, index=df.index) # Sell condition starts as True
+        # Work on the underlying ndarrays: no index alignment, no transient Series
+        close = df['close'].to_numpy()
+        buy_condition = np.ones(len(df), dtype=bool) # Buy condition starts as True
+        sell_condition = np.ones(len(df), dtype=bool) # Sell condition starts as True
 
         # SMA condition
         if col_sma:
-            buy_condition &= (df['close'] > df[col_sma])
-            sell_condition &= (df['close'] < df[col_sma])
+            sma = df[col_sma].to_numpy()
+            price = _as_dtype_of(close, sma)
+            buy_condition &= (price > sma)
+            sell_condition &= (price < sma)
 
         # EMA condition
         if ema_window:
-            col_ema = f'EMA_{ema_window}'
-            buy_condition &= (df['close'] > df[col_ema])
-            sell_condition &= (df['close'] < df[col_ema])
+            ema = df[f'EMA_{ema_window}'].to_numpy()
+            price = _as_dtype_of(close, ema)
+            buy_condition &= (price > ema)
+            sell_condition &= (price < ema)
 
         # RSI condition
         if 'RSI' in df.columns:
-            buy_condition &= (df['RSI'] < rsi_oversold)
-            sell_condition &= (df['RSI'] > rsi_overbought)
+            rsi = df['RSI'].to_numpy()
+            buy_condition &= (rsi < rsi_oversold)
+            sell_condition &= (rsi > rsi_overbought)
 
         # MACD condition
         if use_macd and 'MACD' in df.columns and 'MACD_Signal' in df.columns:
-            buy_condition &= (df['MACD'] > df['MACD_Signal'])
-            sell_condition &= (df['MACD'] < df['MACD_Signal'])
+            macd = df['MACD'].to_numpy()
+            macd_signal = df['MACD_Signal'].to_numpy()
+            buy_condition &= (macd > macd_signal)
+            sell_condition &= (macd < macd_signal)
 
         # Bollinger Bands condition
         if use_bbands and 'BB_Low' in df.columns and 'BB_High' in df.columns:
-            buy_condition &= (df['close'] < df['BB_Low'])
-            sell_condition &= (df['close'] > df['BB_High'])
+            bb_low, bb_high = df['BB_Low'].to_numpy(), df['BB_High'].to_numpy()
+            buy_condition &= (_as_dtype_of(close, bb_low) < bb_low)
+            sell_condition &= (_as_dtype_of(close, bb_high) > bb_high)
 
-        df.loc[buy_condition, 'Signal'] = 1
-        df.loc[sell_condition, 'Signal'] = -1
+        # One sequential write (Sell wins ties, Hold by default); int8 is all a {-1, 0, 1} signal needs
+        df['Signal'] = np.where(sell_condition, np.int8(-1),
+                                np.where(buy_condition, np.int8(1), np.int8(0)))
 
         return df
     
@@ -141,27 +361,26 @@ class TradingEngine:
         if 'Signal' not in df.columns:
             df = self.get_signals(df)
 
-        # 2. Calculate daily returns (percentage change of price)
-        df['market_returns'] = df['close'].pct_change()
-
-        # 3. Strategy returns: 
-        # We multiply the market return by our position from the PREVIOUS period
-        # (Since we can only profit from a move AFTER we buy)
-        df['strategy_returns'] = df['market_returns'] * df['Signal'].shift(1)
-
-        # 4. Calculate cumulative returns
-        df['cum_market_returns'] = (1 + df['market_returns']).cumprod()
-        df['cum_strategy_returns'] = (1 + df['strategy_returns']).cumprod()
+        # 2-4. Returns, cumulative returns and drawdown in a single C++ pass:
+        # - market returns: percentage change of price
+        # - strategy returns: market return times our position from the PREVIOUS period
+        #   (since we can only profit from a move AFTER we buy)
+        # - drawdown: percentage drop from the cumulative maximum of the strategy curve
+        close = np.ascontiguousarray(df['close'].to_numpy(dtype=np.float64))
+        signal = np.ascontiguousarray(df['Signal'].to_numpy(dtype=np.float64))
+        # The running peak stays inside the kernel: only drawdown is reported
+        (market_returns, strategy_returns, cum_market_returns,
+         cum_strategy_returns, drawdown) = trading_core.calculate_backtest_returns(close, signal)
 
-        # Drawdown calculation
-        # Compute the cumulative maximum of the strategy returns
-        df['cum_max'] = df['cum_strategy_returns'].cummax()
-        # Drawdown is defined as the percentage drop from the cumulative maximum
-        df['drawdown'] = (df['cum_strategy_returns'] / df['cum_max']) - 1
+        df['market_returns'] = market_returns
+        df['strategy_returns'] = strategy_returns
+        df['cum_market_returns'] = cum_market_returns
+        df['cum_strategy_returns'] = cum_strategy_returns
+        df['drawdown'] = drawdown
 
         # 5. Calculate final balance
-        final_balance = initial_balance * df['cum_strategy_returns'].iloc[-1]
-        total_return_pct = (df['cum_strategy_returns'].iloc[-1] - 1) * 100
+        final_balance = initial_balance * cum_strategy_returns[-1]
+        total_return_pct = (cum_strategy_returns[-1] - 1) * 100
 
         return {
             'initial_balance': initial_balance,
@@ -182,11 +401,13 @@ class TradingEngine:
         if not os.path.exists(log_dir):
             os.makedirs(log_dir)
 
+        # One clock read for both the file name and the entry (C-level strftime)
+        now = time.localtime()
         safe_symbol = self.symbol.replace("/", "-")
-        filename = f"{log_dir}/{safe_symbol}_{datetime.datetime.now().strftime('%Y%m%d')}.csv"
+        filename = f"{log_dir}/{safe_symbol}_{time.strftime('%Y%m%d', now)}.csv"
         
         log_entry = {
-            'timestamp': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S', now),
             'price': current_price,
             'signal': current_signal,
             'unrealized_pnl_pct': round(unrealized_pnl * 100, 4),
@@ -195,4 +416,31 @@ class TradingEngine:
         }
 
         log_df = pd.DataFrame([log_entry])
-        log_df.to_csv(filename, mode='a', index=False, header=not os.path.isfile(filename))
\ No newline at end of file
+        log_df.to_csv(filename, mode='a', index=False, header=not os.path.isfile(filename))
+
+
+def scan_symbols(engines, timeframe='1h', limit=100, sma_window=20, rsi_window=14, max_workers=None):
+    """Fetches data and computes indicators and signals for several symbols concurrently.
+    Network I/O (ccxt) and the C++ indicator kernels both release the GIL, so
+    one thread per engine overlaps the fetches and the compute across symbols.
+    Engines without an explicit client use their worker thread's own ccxt client
+    (see _shared_exchange), so no client is shared between threads.
+    :param engines: Iterable of TradingEngine instances (one per symbol)
+    :param timeframe: Timeframe for OHLCV data (e.g., '1h', '15m')
+    :param limit: Number of data points to fetch per symbol
+    :param sma_window: Window for Simple Moving Average
+    :param rsi_window: Window for Relative Strength Index
+    :param max_workers: Thread count (defaults to one per engine)
+    :returns: A dictionary mapping each symbol to its DataFrame with indicators and 'Signal'.
+    """
+    engines = list(engines)
+    if not engines:
+        return {}
+
+    def scan(engine):
+        df = engine.fetch_data(timeframe=timeframe, limit=limit)
+        df = engine.add_indicators(df, sma_window=sma_window, rsi_window=rsi_window)
+        return engine.symbol, engine.get_signals(df, sma_window=sma_window)
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(engines)) as pool:
+        return dict(pool.map(scan, engines))
@@ -1,77 +1,240 @@
+import argparse
 import asyncio
-import ccxt.pro as ccxtpro
 import sys
-import os
+import time
 
-# Ensure local imports
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from trading_bot import trading_core
 
-async def symbol_loop(exchange, symbol, manager):
+DEFAULT_SYMBOLS = ['BTC/USDT', 'ETH/USDT', 'SOL/USDT', 'ADA/USDT', 'DOT/USDT', 'BNB/USDT']
+
+class StatusLine:
     """
-    Listens to ticks and dispatches them to MarketManager.
+    Self-overwriting terminal line with the latest close of every symbol.
+    Each symbol's cell is encoded once per update; the line itself is rendered at
+    most once per `interval` and written as bytes straight to the stdout buffer.
+    Updates throttled inside an interval are drawn by a trailing render once it
+    elapses (scheduled on the running event loop), so the line never stays stale.
+    :param symbols: symbols shown, in order
+    :param interval: minimum seconds between two renders (0.05 = 20 Hz)
+    :param out: binary stream, defaults to sys.stdout.buffer
+    :param clock: monotonic time source in seconds
     """
-    timeframe = '1m'
-    print(f"[LOOP] Started monitoring {symbol}")
-    
+
+    def __init__(self, symbols, interval=0.05, out=None, clock=time.monotonic):
+        self._prefixes = {symbol: f"{symbol:<10} | ".encode() for symbol in symbols}
+        self._cells = {symbol: prefix + b"       ---" for symbol, prefix in self._prefixes.items()}
+        self._interval = interval
+        self._next_render = 0.0
+        self._out = out if out is not None else sys.stdout.buffer
+        self._clock = clock
+        self._trailing = None  # Handle of the scheduled trailing render, if any
+
+    def update(self, symbol, close):
+        """Records the latest close of `symbol` and redraws the line if it is due."""
+        self._cells[symbol] = self._prefixes[symbol] + f"{close:>10.2f}".encode()
+
+        now = self._clock()
+        if now >= self._next_render:
+            self._render(now)
+        elif self._trailing is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return  # Synchronous use: the next due update draws it
+            self._trailing = loop.call_later(self._next_render - now, self._flush)
+
+    def _flush(self):
+        """Trailing render: draws the updates throttled during the last interval."""
+        self._trailing = None
+        self._render(self._clock())
+
+    def _render(self, now):
+        if self._trailing is not None:
+            self._trailing.cancel()
+            self._trailing = None
+        self._next_render = now + self._interval
+        self._out.write(b" || ".join(self._cells.values()) + b"\r")
+        self._out.flush()
+
+def price_tick(market, digits=False):
+    """
+    Minimum price increment of a ccxt market (`market['precision']['price']`).
+    :param digits: True if the exchange reports precision as a number of decimal
+        places (ccxt DECIMAL_PLACES mode) rather than as the tick itself (TICK_SIZE mode)
+    :returns: tick size, or 0.0 if the market does not report one
+    """
+    precision = (market or {}).get('precision', {}).get('price')
+    if precision is None:
+        return 0.0
+    return 10.0 ** -precision if digits else float(precision)
+
+async def load_tick_sizes(exchange, symbols):
+    """
+    Loads the price tick size of every symbol (one markets request).
+    :returns: dict symbol -> tick size; symbols without one map to 0.0
+    """
+    import ccxt
+
     try:
-        # Warm-up
-        # Download last 100 candles
-        print(f"--- [WARM-UP] Fetching history for {symbol} ---")
-        history = await exchange.fetch_ohlcv(symbol, timeframe, limit=100)
-        for candle in history:
-            # Update C++ buffer
-            manager.update_tick(symbol, candle[4])
-        
-        # Start stream loop
-        print(f"[LOOP] Starting real-time monitor for {symbol}")
-        while True:
-            # Get update through WebSocket
-            ohlcv = await exchange.watch_ohlcv(symbol, timeframe)
-            if not ohlcv:
-                continue
-            
-            # Extract last closing price of current candle
-            last_close = ohlcv[-1][4]
-            
-            # Dispatch data to C++ engine.
-            manager.update_tick(symbol, last_close)
-            
+        markets = await exchange.load_markets()
     except Exception as e:
-        print(f"[!] Error in {symbol} loop: {e}")
+        print(f"[!] Could not load markets, tick sizes unknown: {e}")
+        return {symbol: 0.0 for symbol in symbols}
+    digits = exchange.precisionMode == ccxt.DECIMAL_PLACES
+    return {symbol: price_tick(markets.get(symbol), digits) for symbol in symbols}
+
+async def warmup(exchange, symbol, manager, timeframe='1m'):
+    """
+    Loads the recent candle history of a symbol into MarketManager.
+    :returns: (timestamp_ms, close) of the last candle dispatched, or None.
+    """
+    # Download last 100 candles
+    print(f"--- [WARM-UP] Fetching history for {symbol} ---")
+    history = await exchange.fetch_ohlcv(symbol, timeframe, limit=100)
+    for candle in history:
+        # Update C++ buffer (the last candle may still be forming)
+        manager.update_candle(symbol, candle[0], candle[4])
+
+    return (history[-1][0], history[-1][4]) if history else None
+
+async def stream_loop(exchange, symbols, manager, last_dispatched, queue, timeframe='1m', status=None,
+                      tick_sizes=None):
+    """
+    Listens to the candles of every symbol over a single multi-stream
+    subscription and queues them for dispatch_loop, so the websocket reader
+    never waits on the C++ side.
+    :param last_dispatched: dict symbol -> (timestamp_ms, close) of the last candle sent
+    :param queue: asyncio.Queue receiving (symbol_id, timestamp_ms, close) entries
+    :param status: optional StatusLine showing the latest closes
+    :param tick_sizes: optional dict symbol -> price tick; moves of the forming
+        candle smaller than a tick are not dispatched
+    """
+    tick_sizes = tick_sizes or {}
+    subscriptions = [[symbol, timeframe] for symbol in symbols]
+    # Interned once: the hot path passes an integer instead of converting/hashing the string
+    symbol_ids = {symbol: manager.register_symbol(symbol) for symbol in symbols}
+    print(f"[LOOP] Starting real-time monitor for {len(symbols)} symbols")
+
+    while True:
+        try:
+            # Get update through WebSocket: {symbol: {timeframe: candles}} for
+            # whichever stream ticked, all multiplexed on one connection
+            update = await exchange.watch_ohlcv_for_symbols(subscriptions)
+        except Exception as e:
+            print(f"[!] Error in stream loop: {e}")
+            await asyncio.sleep(1)
+            continue
+
+        for symbol, by_timeframe in update.items():
+            for ohlcv in by_timeframe.values():
+                # The batch may hold the final update of a candle that just closed
+                # followed by the newly opened one: dispatch them in order
+                for candle in ohlcv:
+                    timestamp, last_close = candle[0], candle[4]
+
+                    # Memoization: nothing changed since the last dispatch (the stream
+                    # often re-delivers an unchanged candle, or one that only moved by
+                    # sub-tick rounding noise), skip it
+                    last = last_dispatched.get(symbol)
+                    if (last is not None and timestamp == last[0]
+                            and (last_close == last[1]
+                                 or abs(last_close - last[1]) < tick_sizes.get(symbol, 0.0))):
+                        continue
+                    last_dispatched[symbol] = (timestamp, last_close)
+
+                    # Hand over to the dispatcher (only waits if the queue is full)
+                    await queue.put((symbol_ids[symbol], timestamp, last_close))
+                    if status is not None:
+                        status.update(symbol, last_close)
+
+async def dispatch_loop(queue, manager, max_batch=64):
+    """
+    Consumes the stream_loop queue: every wake-up takes whatever is queued (up to
+    `max_batch` entries) and dispatches it to MarketManager in one call. Same
+    timestamp replaces the forming candle in place, a new one closes the previous.
+    :param queue: asyncio.Queue of (symbol_id, timestamp_ms, close) entries
+    :param max_batch: maximum entries per call
+    """
+    while True:
+        batch = [await queue.get()]
+        while len(batch) < max_batch and not queue.empty():
+            batch.append(queue.get_nowait())
+        try:
+            manager.update_candles_id(batch)
+        except Exception as e:
+            # Drop the batch but keep draining: a dead consumer would fill the
+            # queue and block stream_loop on put() forever
+            print(f"[!] Error dispatching {len(batch)} updates: {e}")
+
+async def run_realtime_monitor(symbols=DEFAULT_SYMBOLS, num_threads=4, timeframe='1m'):
+    # Deferred: ccxt.pro takes a noticeable time to import, `--help` should not pay for it
+    import ccxt.pro as ccxtpro
+
+    # 1. Create MarketManager instance with its pool of C++ threads
+    manager = trading_core.MarketManager(num_threads)
 
-async def run_realtime_monitor():
-    # 1. Create MarketManager instance with 4 C++ threads
-    manager = trading_core.MarketManager(4)
-    
     # 2. Configure Exchange
     exchange = ccxtpro.binance({'enableRateLimit': True})
-    
-    # 3. List of symbols (coins) to monitor
-    symbols = [
-        'BTC/USDT', 
-        'ETH/USDT', 
-        'SOL/USDT', 
-        'ADA/USDT', 
-        'DOT/USDT', 
-        'BNB/USDT'
-        ]
-    
+
+    # 3. Symbols (coins) to monitor
+    symbols = list(symbols)
+
     print(f"--- [INIT] Dispatching {len(symbols)} symbols to C++ Core ---")
     
-    # 4. Create a task for each symbol
-    tasks = [symbol_loop(exchange, symbol, manager) for symbol in symbols]
-    
     try:
-        # Concurrently run all loops
-        await asyncio.gather(*tasks)
+        # 4. Warm up every symbol concurrently (ccxt.pro requests are non-blocking
+        # coroutines), so streaming only starts once every buffer is hot
+        results = await asyncio.gather(
+            *(warmup(exchange, symbol, manager, timeframe) for symbol in symbols),
+            return_exceptions=True,
+        )
+        last_candles = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                print(f"[!] Warm-up failed for {symbol}: {result}")
+            elif result is not None:
+                last_candles[symbol] = result
+
+        # 5. One stream for every symbol; the C++ thread pool still fans the work out
+        # (websocket ingest and C++ dispatch run as separate tasks joined by a queue)
+        tick_sizes = await load_tick_sizes(exchange, symbols)
+        queue = asyncio.Queue(maxsize=4096)
+        tasks = [
+            asyncio.create_task(stream_loop(exchange, symbols, manager, last_candles, queue,
+                                            timeframe, StatusLine(symbols), tick_sizes)),
+            asyncio.create_task(dispatch_loop(queue, manager)),
+        ]
+        try:
+            # Both loops run forever: if either one ends, the monitor ends with its error
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
     except asyncio.CancelledError:
         pass
     finally:
         await exchange.close()
 
-if __name__ == "__main__":
+def main(argv=None):
+    """
+    Command-line entry point (`trading-bot`).
+    :param argv: argument list, defaults to sys.argv[1:]
+    """
+    parser = argparse.ArgumentParser(description="Real-time multi-symbol market monitor.")
+    parser.add_argument('symbols', nargs='*', default=DEFAULT_SYMBOLS,
+                        help="symbols to monitor (default: %(default)s)")
+    parser.add_argument('--threads', type=int, default=4,
+                        help="C++ worker threads (default: %(default)s)")
+    parser.add_argument('--timeframe', default='1m',
+                        help="candle timeframe (default: %(default)s)")
+    args = parser.parse_args(argv)
+
     try:
-        asyncio.run(run_realtime_monitor())
+        asyncio.run(run_realtime_monitor(args.symbols, args.threads, args.timeframe))
     except KeyboardInterrupt:
-        print("\n[OK] Stopping monitor...")
\ No newline at end of file
+        print("\n[OK] Stopping monitor...")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file